@@ -0,0 +1,96 @@
+import gzip
+import os
+import re
+import shutil
+from data_source import file_digest
+
+# Static files every page references; --optimize publishes them under content-hashed names
+ASSET_FILES = ['style.css', 'script.js']
+ASSET_HASH_LENGTH = 10
+
+# Precompressed siblings written next to every page and data file
+COMPRESSED_SUFFIXES = ['.gz', '.br']
+COPY_BLOCK_SIZE = 1 << 20
+
+# Whitespace is significant inside these elements, so they are copied as is
+PRESERVE_RE = re.compile(r'<(script|pre|textarea)\b.*?</\1\s*>', re.S | re.I)
+COMMENT_RE = re.compile(r'<!--(?!\[).*?-->', re.S)
+# Line breaks between two tags (or a tag and a preserved element) are only source formatting
+TAG_GAP_RE = re.compile(r'(^|>)\s*\n\s*(<|$)')
+SPACE_RE = re.compile(r'\s+')
+
+
+def brotli_module():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def collapse_whitespace(html):
+    html = COMMENT_RE.sub('', html)
+    return SPACE_RE.sub(' ', TAG_GAP_RE.sub(r'\1\2', html))
+
+
+# Drop comments and formatting whitespace; streamed pages are minified chunk by chunk
+def minify_html(html):
+    parts = []
+    position = 0
+    for match in PRESERVE_RE.finditer(html):
+        parts.append(collapse_whitespace(html[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(collapse_whitespace(html[position:]))
+    return ''.join(parts)
+
+
+# Write path.gz (and path.br when brotli is installed) from the file on disk.
+# gzip headers carry no name or mtime, so unchanged pages compress identically.
+def compress_file(path):
+    with open(path, 'rb') as src, open(path + '.gz', 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as out:
+            shutil.copyfileobj(src, out, COPY_BLOCK_SIZE)
+
+    brotli = brotli_module()
+    if brotli is None:
+        remove_compressed(path, ['.br'])
+        return
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+    with open(path, 'rb') as src, open(path + '.br', 'wb') as out:
+        for block in iter(lambda: src.read(COPY_BLOCK_SIZE), b''):
+            out.write(compressor.process(block))
+        out.write(compressor.finish())
+
+
+# Remove stale compressed siblings, e.g. after a build without --optimize
+def remove_compressed(path, suffixes=COMPRESSED_SUFFIXES):
+    for suffix in suffixes:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def hashed_name(name, digest):
+    base, ext = os.path.splitext(name)
+    return f'{base}.{digest[:ASSET_HASH_LENGTH]}{ext}'
+
+
+# Copy each asset to a content-hashed name (plus compressed siblings) and remove
+# older hashed copies. Returns {asset: published name} for the templates.
+def publish_assets(directory='.', names=ASSET_FILES, compress=True):
+    published = {}
+    for name in names:
+        target = hashed_name(name, file_digest(os.path.join(directory, name)))
+        target_path = os.path.join(directory, target)
+        if not os.path.exists(target_path):
+            shutil.copyfile(os.path.join(directory, name), target_path)
+        if compress:
+            compress_file(target_path)
+
+        base, ext = os.path.splitext(name)
+        stale = re.compile(rf'{re.escape(base)}\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}{re.escape(ext)}(\.gz|\.br)?')
+        for existing in os.listdir(directory):
+            if stale.fullmatch(existing) and not existing.startswith(target):
+                os.remove(os.path.join(directory, existing))
+        published[name] = target
+    return published
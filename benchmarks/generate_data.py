@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from fleet_registry import load_registry  # noqa: E402
+from data_source import CSV_COLUMNS  # noqa: E402
+
+MAKES = ['GNE', 'JLG', 'SNK', 'HAU']
+BUILDERS = ['Mattamy Homes', 'Caivan Group', 'Eden Oak', 'Branthaven', 'Charleston Homes',
+            'Dincenzo', 'Fieldgate', 'Greenpark', 'Minto', 'M&D General Contracting']
+ISSUES = ['Hydraulic leak at boom cylinder', 'Tire pressure low, front left', 'Basket rotation sticks',
+          'Radiator fan clutch noisy', 'Battery weak on cold start', 'Joystick slow to respond']
+WORK = ['Replaced hydraulic hose', 'Greased pivot points', 'Replaced tire', 'Adjusted basket rotation']
+
+# Share of rows carrying each optional value
+ISSUE_RATE = 0.08
+FLAG_RATES = {'Oil Change': 0.01, 'Annual Inspection': 0.002, 'NDT': 0.002, 'Radiator Repair': 0.003}
+OTHER_WORK_RATE = 0.005
+
+
+def lift_ids(count):
+    ids = list(load_registry(os.path.join(ROOT, 'data', 'fleet.json')).lift_ids)
+    number = 1
+    while len(ids) < count:
+        candidate = f"B_{MAKES[number % len(MAKES)]}_{number:03d}"
+        if candidate not in ids:
+            ids.append(candidate)
+        number += 1
+    return ids[:count]
+
+
+# Format timestamps like the form export: M/D/YYYY H:MM without zero padding
+def format_times(times):
+    return (times.month.astype(str) + '/' + times.day.astype(str) + '/' + times.year.astype(str) + ' '
+            + times.hour.astype(str) + ':' + times.minute.map('{:02d}'.format))
+
+
+# Costs in dollars and cents, as the form accepts them (step 0.01)
+def cents(rng, rows, low, high):
+    return (rng.integers(low * 100, high * 100, rows) / 100).astype(str)
+
+
+def sparse(rng, rows, rate, values):
+    picked = rng.random(rows) < rate
+    out = np.full(rows, '', dtype=object)
+    out[picked] = rng.choice(values, picked.sum())
+    return out
+
+
+# A time-ordered submission log: each lift's hours only increase, maintenance is rare
+def generate(rows, lifts=None, names=None, sites=None, seed=0,
+             start='2024-12-30', end='2026-06-30'):
+    rng = np.random.default_rng(seed)
+    lifts = lifts or max(10, min(2000, rows // 200))
+    names = names or max(5, min(500, rows // 500))
+    sites = sites or max(5, min(1000, rows // 200))
+    lift_list = lift_ids(lifts)
+
+    start_ns = pd.Timestamp(start).value
+    end_ns = pd.Timestamp(end).value
+    times = pd.DatetimeIndex(np.sort(rng.integers(start_ns, end_ns, rows))).floor('min')
+    lift_index = rng.integers(0, lifts, rows)
+
+    # Hours grow per lift from a random starting meter reading
+    increments = rng.integers(0, 9, rows)
+    frame = pd.DataFrame({'lift': lift_index, 'inc': increments})
+    hours = frame.groupby('lift')['inc'].cumsum().to_numpy() + rng.integers(1000, 60000, lifts)[lift_index]
+
+    data = {
+        'Completion time': format_times(times),
+        'Name': rng.choice([f'Installer {i:03d}' for i in range(names)], rows),
+        'Boom Lift ID': np.array(lift_list, dtype=object)[lift_index],
+        'Builder': rng.choice(BUILDERS, rows),
+        'Site': rng.choice([f'Site {i:04d}' for i in range(sites)], rows),
+        'Location': sparse(rng, rows, 0.3, ['43.4675, -79.6877', '43.8561, -79.3370', '44.3001, -79.6133']),
+        'Hours': hours,
+        'Oil Level': rng.choice(['High', 'Sufficient', 'Low'], rows),
+        'Gas Level': rng.choice(['Full', 'Half', 'Low'], rows),
+        'General Issues': sparse(rng, rows, ISSUE_RATE, ISSUES),
+    }
+    any_work = np.zeros(rows, dtype=bool)
+    for col, rate in FLAG_RATES.items():
+        flagged = rng.random(rows) < rate
+        any_work |= flagged
+        data[col] = np.where(flagged, 'True', '')
+        data[f'{col} Cost'] = np.where(flagged, cents(rng, rows, 100, 900), '')
+    data['Other Work'] = sparse(rng, rows, OTHER_WORK_RATE, WORK)
+    data['Other Work Cost'] = np.where(data['Other Work'] != '', cents(rng, rows, 50, 500), '')
+    data['Maintenance Work'] = np.where(any_work, rng.choice(WORK, rows), '')
+    return pd.DataFrame(data)[CSV_COLUMNS]
+
+
+# Fleet registry listing every lift of a generated log, written next to it
+def registry_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.fleet.json'
+
+
+def write_csv(path, rows, **kwargs):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    frame = generate(rows, **kwargs)
+    frame.to_csv(path, index=False)
+    with open(registry_path(path), 'w') as f:
+        json.dump({'lifts': [{'id': lift_id} for lift_id in sorted(frame['Boom Lift ID'].unique())]}, f, indent=2)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic boom_lift_data.csv for benchmarking.')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lifts', type=int, default=None, help='Number of lifts (default: scales with rows)')
+    parser.add_argument('--names', type=int, default=None, help='Number of installers (default: scales with rows)')
+    parser.add_argument('--sites', type=int, default=None, help='Number of sites (default: scales with rows)')
+    args = parser.parse_args(argv)
+    write_csv(args.output, args.rows, lifts=args.lifts, names=args.names, sites=args.sites, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.output} and its fleet registry to {registry_path(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
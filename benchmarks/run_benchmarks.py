@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+from assets import ASSET_FILES  # noqa: E402
+from benchmarks.generate_data import registry_path, write_csv  # noqa: E402
+from cost_cube import compute_cube  # noqa: E402
+from data_source import parse_csv  # noqa: E402
+from fleet_registry import load_registry  # noqa: E402
+from fleet_state import compute_fleet_state, format_boom_summary  # noqa: E402
+from generate_html import display_columns  # noqa: E402
+from html_table import iter_html_table  # noqa: E402
+from lift_history import generate_lift_history, lift_tables, summarize_lifts  # noqa: E402
+from pay_periods import (  # noqa: E402
+    add_period_columns, calendar_entries, generate_pay_period_summary, period_start, summarize_periods
+)
+from site_data import build_user_summary, prepare_valid_df  # noqa: E402
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DATA_DIR = os.path.join(ROOT, 'benchmarks', 'data')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+class Timer:
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.stages[name] = round(time.perf_counter() - start, 6)
+        return result
+
+
+def dataset(rows, seed):
+    path = os.path.join(DATA_DIR, f'{rows}-seed{seed}.csv')
+    if not os.path.exists(path) or not os.path.exists(registry_path(path)):
+        print(f"Generating {rows} rows -> {path}")
+        write_csv(path, rows, seed=seed)
+    return path
+
+
+def render_table_to(path, frame):
+    with open(path, 'w') as f:
+        for chunk in iter_html_table(frame, display_columns, 'full-data-table'):
+            f.write(chunk)
+
+
+# End-to-end generator runs in a scratch directory: a forced build, then a no-op rebuild
+def run_build(csv_path, timer, build_args):
+    script = os.path.join(ROOT, 'generate_html.py')
+    with tempfile.TemporaryDirectory() as workdir:
+        # --optimize publishes hashed copies of the assets from the working directory
+        for asset in ASSET_FILES:
+            shutil.copyfile(os.path.join(ROOT, asset), os.path.join(workdir, asset))
+        for name, extra in [('build_full', ['--force']), ('build_noop', [])]:
+            command = [sys.executable, script, 'build', '--source', csv_path, '--fleet', registry_path(csv_path),
+                       '--no-cache'] + extra + build_args
+            timer(name, subprocess.run, command, cwd=workdir, check=True, stdout=subprocess.DEVNULL)
+
+
+def bench_size(rows, seed, build, build_args):
+    csv_path = dataset(rows, seed)
+    timer = Timer()
+    df = timer('load', parse_csv, csv_path)
+    registry = load_registry(registry_path(csv_path))
+    lifts = registry.lift_ids
+    valid_df = timer('prepare', prepare_valid_df, df, registry)
+    timer('boom_summary', lambda: format_boom_summary(compute_fleet_state(valid_df, lifts)))
+    cube = timer('cost_cube', compute_cube, valid_df)
+    timer('user_summary', build_user_summary, cube)
+    timeline, events = timer('lift_tables', lift_tables, valid_df)
+    lift_summaries = timer('lift_summaries', summarize_lifts, timeline, events, lifts, cube)
+    timer('lift_render', lambda: [generate_lift_history(lift_id, lift_summaries[lift_id]) for lift_id in lifts])
+
+    timer('period_bucketing', add_period_columns, valid_df)
+    numbers = sorted(int(n) for n in valid_df['Period'].dropna().unique() if n >= 0)
+    entries = timer('period_calendars', calendar_entries, valid_df, numbers)
+    summaries = timer('period_summaries', summarize_periods, entries, numbers, cube)
+    period_times = {}
+    for number in numbers:
+        start = time.perf_counter()
+        generate_pay_period_summary(period_start(number), summaries[number])
+        period_times[period_start(number).strftime('%Y-%m-%d')] = round(time.perf_counter() - start, 6)
+
+    full_data_df = valid_df[display_columns].sort_values('Completion time', ascending=False, kind='stable')
+    with tempfile.TemporaryDirectory() as workdir:
+        timer('render_full_table', render_table_to, os.path.join(workdir, 'table.html'), full_data_df)
+
+    if build:
+        run_build(csv_path, timer, build_args)
+
+    return {
+        'rows': rows,
+        'valid_rows': len(valid_df),
+        'lifts': len(lifts),
+        'periods': len(numbers),
+        'stages': timer.stages,
+        'pay_period_render': period_times,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# Print per-stage timings next to a previous results file
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"{'rows':>9} {'stage':<20} {'before':>10} {'after':>10} {'ratio':>7}")
+    for rows, result in current['results'].items():
+        before = baseline['results'].get(rows, {}).get('stages', {})
+        for stage, seconds in result['stages'].items():
+            if stage in before and before[stage] > 0:
+                print(f"{rows:>9} {stage:<20} {before[stage]:>10.4f} {seconds:>10.4f} {seconds / before[stage]:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time each generator stage on synthetic submission logs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Previous results JSON to compare against')
+    parser.add_argument('--no-build', action='store_true', help='Skip the end-to-end generate_html.py runs')
+    parser.add_argument('--build-args', nargs=argparse.REMAINDER, default=[],
+                        help='Extra arguments for the end-to-end builds: everything after --build-args')
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'build_args': args.build_args,
+        'results': {},
+    }
+    for rows in args.sizes:
+        print(f"Benchmarking {rows} rows")
+        report['results'][str(rows)] = bench_size(rows, args.seed, not args.no_build, args.build_args)
+        print(json.dumps(report['results'][str(rows)]['stages'], indent=2))
+
+    output = args.output or os.path.join(RESULTS_DIR, f'{commit}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import json
+import pandas as pd
+from data_source import COST_COLUMNS, FLAG_COLUMNS, concat_frames
+from pay_periods import PERIOD_ANCHOR, PERIOD_DAYS, period_numbers
+
+# Submission counts, issue counts and maintenance totals by lift x pay period x
+# builder x name, aggregated once per build. The user summary, the pay period
+# builder tables and the lift history cost tables are all sliced from it, and it
+# is published for client-side dashboards, so new cost views need no extra scan.
+CUBE_PATH = 'cost-cube.json'
+CUBE_DIMENSIONS = ['Boom Lift ID', 'Period', 'Builder', 'Name']
+JSON_BLOCK_ROWS = 10000
+
+# Cost column of each kind of work; Other Work is free text rather than a flag
+WORK_COSTS = dict(zip(FLAG_COLUMNS + ['Other Work'], COST_COLUMNS))
+EVENT_MEASURES = [f'{work} events' for work in WORK_COSTS]
+COST_MEASURES = list(WORK_COSTS.values())
+
+# How each measure rolls up; every slice of the cube uses the same reducers
+AGGREGATIONS = {'submissions': 'sum', 'issues': 'sum', 'latest_submission': 'max'}
+AGGREGATIONS.update({measure: 'sum' for measure in EVENT_MEASURES + COST_MEASURES})
+MEASURES = list(AGGREGATIONS)
+
+# Submission columns the cube reads
+CUBE_COLUMNS = ['Completion time', 'Boom Lift ID', 'Builder', 'Name', 'General Issues'] + list(WORK_COSTS) + COST_MEASURES
+
+
+# Per-row measures, so the cube is a single grouped sum/max
+def measure_frame(df):
+    time = df['Completion time']
+    frame = pd.DataFrame({
+        'Boom Lift ID': df['Boom Lift ID'],
+        'Period': period_numbers(time),
+        'Builder': df['Builder'],
+        'Name': df['Name'],
+        'submissions': time.notna().astype('int64'),
+        'issues': (df['General Issues'] != '').astype('int64'),
+        'latest_submission': time,
+    })
+    for work, cost in WORK_COSTS.items():
+        done = df[work] != '' if work == 'Other Work' else df[work].fillna(False).astype(bool)
+        frame[f'{work} events'] = done.astype('int64')
+        frame[cost] = df[cost].astype('float64')
+    return frame
+
+
+# Roll rows (or finer-grained totals) up to the cube's dimensions. Missing builders
+# and names are kept as their own cells so every slice still adds up to the log.
+def aggregate(frame):
+    return frame.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False).agg(AGGREGATIONS).reset_index()
+
+
+# The cube from a prepared frame (site_data.prepare_valid_df) in one vectorised pass
+def compute_cube(df):
+    return aggregate(measure_frame(df[CUBE_COLUMNS]))
+
+
+# One cube from the cubes of consecutive chunks of the log
+def combine_cubes(cubes):
+    return aggregate(concat_frames(cubes))
+
+
+# The cube from per-day totals, as sqlite_store.daily_totals returns them; raw
+# lift IDs are mapped to registered lifts before rolling up
+def cube_from_daily_totals(totals, registry):
+    totals['Boom Lift ID'] = registry.canonical_ids(totals['Boom Lift ID'])
+    totals['Period'] = period_numbers(totals.pop('Day'))
+    return aggregate(totals)
+
+
+# Totals per value of one or more dimensions, optionally for some periods only
+def slice_totals(cube, by, periods=None):
+    if periods is not None:
+        cube = cube[cube['Period'].isin(periods)]
+    return cube.groupby(by, observed=True).agg(AGGREGATIONS)
+
+
+# Columnar JSON for the published artifact, as string chunks of JSON_BLOCK_ROWS rows
+# so the cube is never converted to Python objects all at once; periods are
+# numbered from PERIOD_ANCHOR. Rows are sorted by their dimensions, so every
+# backend publishes the same file whatever order its groups came out in.
+def cube_json(cube):
+    cube = cube.sort_values(CUBE_DIMENSIONS, key=lambda col: col if col.name == 'Period' else col.astype(str),
+                            kind='stable')
+    head = json.dumps({
+        'period_anchor': PERIOD_ANCHOR.strftime('%Y-%m-%d'),
+        'period_days': PERIOD_DAYS,
+        'dimensions': CUBE_DIMENSIONS,
+        'measures': MEASURES,
+        'rows': [],
+    }, separators=(',', ':'))
+    yield head[:-len(']}')]
+    for start in range(0, len(cube), JSON_BLOCK_ROWS):
+        block = cube.iloc[start:start + JSON_BLOCK_ROWS]
+        rows = block.astype(object).where(block.notna(), None)
+        rows['latest_submission'] = [None if t is None else t.isoformat() for t in rows['latest_submission']]
+        for measure in COST_MEASURES:
+            rows[measure] = [None if c is None else round(c, 2) for c in rows[measure]]
+        text = json.dumps(rows[CUBE_DIMENSIONS + MEASURES].values.tolist(), separators=(',', ':'))
+        yield (',' if start else '') + text[1:-1]
+    yield ']}'
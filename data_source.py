@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import pickle
+from datetime import datetime
+
+# Submission log locations
+DEFAULT_CSV_PATH = 'data/boom_lift_data.csv'
+CSV_URL = 'https://raw.githubusercontent.com/MDGeneralContracting/md-maintenance-website/main/data/boom_lift_data.csv'
+
+# pandas and requests are imported where used so that ingest.py and partial
+# builds that never parse the CSV do not pay for them
+
+# Local cache for HTTP downloads and parsed frames
+CACHE_DIR = '.cache'
+HTTP_CACHE_FILE = 'http-cache.json'
+
+# Bump when the parsing below changes so stale frame caches are ignored
+FRAME_CACHE_VERSION = 4
+
+# Typed schema for the submission log. Repeated labels are categoricals, flags are
+# real booleans, Hours is a nullable integer and costs are float64, which prints
+# submitted amounts like 49.99 exactly as entered; free text columns keep pandas'
+# default string type.
+COMPLETION_TIME_FORMAT = '%m/%d/%Y %H:%M'
+# Completion times are site-local; times written with a UTC offset are converted to it
+LOCAL_TIMEZONE = 'America/Toronto'
+# Trailing 'Z' or UTC offset of an ISO time
+UTC_OFFSET_PATTERN = r'(?:Z|[+-]\d\d:?\d\d)$'
+# Column order of data/boom_lift_data.csv
+CSV_COLUMNS = [
+    'Completion time', 'Name', 'Boom Lift ID', 'Builder', 'Site', 'Location', 'Hours',
+    'Oil Level', 'Gas Level', 'General Issues', 'Oil Change', 'Oil Change Cost',
+    'Annual Inspection', 'Annual Inspection Cost', 'NDT', 'NDT Cost', 'Radiator Repair',
+    'Radiator Repair Cost', 'Other Work', 'Other Work Cost', 'Maintenance Work'
+]
+CATEGORY_COLUMNS = ['Name', 'Boom Lift ID', 'Builder', 'Site', 'Location', 'Oil Level', 'Gas Level']
+FLAG_COLUMNS = ['Oil Change', 'Annual Inspection', 'NDT', 'Radiator Repair']
+# Cost of each flagged kind of work, in FLAG_COLUMNS order, then of Other Work
+COST_COLUMNS = ['Oil Change Cost', 'Annual Inspection Cost', 'NDT Cost', 'Radiator Repair Cost', 'Other Work Cost']
+# Flag values read as True, in the CSV and in form payloads ('on' is a checked box)
+TRUE_VALUES = ['true', '1', '1.0', 'yes', 'on']
+
+# Rows per chunk when the log is read in chunks (build --stream)
+CHUNK_ROWS = 20000
+
+
+def is_url(source):
+    return source.startswith('http://') or source.startswith('https://')
+
+
+# One Completion time as a naive site-local datetime: the form export's format, or
+# ISO, where a time given with 'Z' or an offset is converted to LOCAL_TIMEZONE.
+# Raises ValueError for anything else.
+def parse_local_time(text):
+    try:
+        return datetime.strptime(text, COMPLETION_TIME_FORMAT)
+    except ValueError:
+        when = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    if when.tzinfo is not None:
+        from zoneinfo import ZoneInfo
+        when = when.astimezone(ZoneInfo(LOCAL_TIMEZONE)).replace(tzinfo=None)
+    return when
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Flags are read as categoricals so only their few distinct labels are converted
+def read_dtypes():
+    dtypes = {'Hours': 'float64'}
+    dtypes.update({col: 'category' for col in CATEGORY_COLUMNS + FLAG_COLUMNS})
+    dtypes.update({col: 'float64' for col in COST_COLUMNS})
+    return dtypes
+
+
+def parse_flags(series):
+    import numpy as np
+    import pandas as pd
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(str).astype('category')
+    labels = series.cat.categories.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+    # Code -1 (missing) picks the trailing False
+    return pd.Series(np.append(labels, False)[series.cat.codes.to_numpy()], index=series.index)
+
+
+# Parse Completion time with the form export's format, falling back to
+# per-value inference if some rows were written differently. ISO times with a
+# 'Z' or offset, as older form submissions appended them, become local times.
+def parse_times(values):
+    import pandas as pd
+    try:
+        return pd.to_datetime(values, format=COMPLETION_TIME_FORMAT)
+    except ValueError:
+        pass
+    text = pd.Series(values).astype('string').str.strip()
+    aware = text.str.contains(UTC_OFFSET_PATTERN, na=False)
+    times = pd.to_datetime(text.where(~aware), format='mixed')
+    if aware.any():
+        utc = pd.to_datetime(text[aware], format='mixed', utc=True)
+        times[aware] = utc.dt.tz_convert(LOCAL_TIMEZONE).dt.tz_localize(None)
+    return times
+
+
+# Convert a frame with any subset of the log's columns to the typed schema
+def apply_schema(df):
+    import numpy as np
+    import pandas as pd
+
+    if 'Completion time' in df and df['Completion time'].dtype.kind != 'M':
+        df['Completion time'] = parse_times(df['Completion time'])
+    for col in CATEGORY_COLUMNS:
+        if col in df and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in FLAG_COLUMNS:
+        if col in df and df[col].dtype != bool:
+            df[col] = parse_flags(df[col])
+    for col in COST_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('float64')
+    if 'Hours' in df:
+        # Fractional readings are truncated, as int() did
+        hours = df['Hours'].astype('float64')
+        df['Hours'] = hours.where(hours.isna(), np.trunc(hours)).astype('Int64')
+    return df
+
+
+# read_csv options for the typed schema; columns limits reading to the columns a page needs.
+# Completion time is left as text if the explicit format does not fit every row.
+def read_options(columns=None):
+    usecols = None if columns is None else (lambda col: col in columns)
+    parse_dates = ['Completion time'] if columns is None or 'Completion time' in columns else False
+    return {'usecols': usecols, 'dtype': read_dtypes(), 'parse_dates': parse_dates,
+            'date_format': COMPLETION_TIME_FORMAT}
+
+
+# Parse the raw CSV into a typed dataframe
+def parse_csv(path, columns=None):
+    import pandas as pd
+    return apply_schema(pd.read_csv(path, **read_options(columns)))
+
+
+# Parse the raw CSV chunk_rows rows at a time, each chunk in the typed schema, so
+# memory does not grow with the log. Categories are per chunk.
+def iter_csv_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    import pandas as pd
+    with pd.read_csv(path, chunksize=chunk_rows, **read_options(columns)) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+# Feed the row hashes of each group of frame into digests ({key: sha256 object});
+# groups whose key is not in digests are ignored. Feeding consecutive chunks of a
+# frame leaves the same digests as feeding the whole frame.
+def update_group_digests(digests, frame, keys):
+    import pandas as pd
+    if frame.empty:
+        return digests
+    hashes = pd.util.hash_pandas_object(frame, index=False)
+    for key, group in hashes.groupby(keys, observed=True):
+        if key in digests:
+            digests[key].update(group.values.tobytes())
+    return digests
+
+
+# pd.concat of frames whose categorical columns keep their dtype; plain pd.concat
+# falls back to object columns unless every frame has the same categories
+def concat_frames(frames):
+    import pandas as pd
+    frames = [frame.copy(deep=False) for frame in frames]
+    for col in frames[0].columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = frames[0][col].cat.categories
+            for frame in frames[1:]:
+                categories = categories.union(frame[col].cat.categories)
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def columns_key(columns):
+    if columns is None:
+        return 'all'
+    return hashlib.sha256('\0'.join(sorted(columns)).encode()).hexdigest()[:12]
+
+
+# Download a CSV with a conditional request, reusing the local copy on 304 Not Modified
+def fetch_url(url, cache_dir=CACHE_DIR, timeout=10):
+    import requests
+
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, HTTP_CACHE_FILE)
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    local_path = os.path.join(cache_dir, 'download-' + hashlib.sha256(url.encode()).hexdigest()[:16] + '.csv')
+    entry = meta.get(url, {})
+    headers = {}
+    if os.path.exists(local_path):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    # The body is streamed to disk, so the download is never held in memory
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304:
+            print(f"Not modified, using cached download: {url}")
+            return local_path
+        response.raise_for_status()
+        tmp_path = local_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for block in response.iter_content(1 << 20):
+                f.write(block)
+        os.replace(tmp_path, local_path)
+        meta[url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return local_path
+
+
+# Load a local CSV, reusing a pickled frame keyed on the file's content hash and the
+# selected columns. Frames of older versions of the file are removed.
+def load_csv(path, cache_dir=CACHE_DIR, columns=None):
+    if cache_dir is None:
+        return parse_csv(path, columns)
+
+    digest = file_digest(path)
+    key = f"{digest}-{columns_key(columns)}-v{FRAME_CACHE_VERSION}"
+    cache_path = os.path.join(cache_dir, f"frame-{key}.pkl")
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable frame cache {cache_path}: {e}")
+
+    df = parse_csv(path, columns)
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):
+        if name.startswith('frame-') and name.endswith('.pkl') and not name.startswith(f'frame-{digest}-'):
+            os.remove(os.path.join(cache_dir, name))
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return df
+
+
+# Load the submission log from a local path or URL; cache_dir=None disables all caching
+def read_submissions(source=DEFAULT_CSV_PATH, cache_dir=CACHE_DIR, columns=None):
+    if is_url(source):
+        if cache_dir is None:
+            from io import StringIO
+            import requests
+            response = requests.get(source, timeout=10)
+            response.raise_for_status()
+            return parse_csv(StringIO(response.text), columns)
+        source = fetch_url(source, cache_dir)
+    return load_csv(source, cache_dir, columns)
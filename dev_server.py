@@ -0,0 +1,200 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from assets import ASSET_FILES
+from data_source import DEFAULT_CSV_PATH, is_url
+
+# Watch mode polls its inputs instead of depending on a file-watching package;
+# a handful of stat() calls every POLL_S is cheap. Changes are collected until
+# nothing has changed for DEBOUNCE_S, so an editor's save-and-rename or an
+# ingest batch triggers one rebuild.
+POLL_S = 0.1
+DEBOUNCE_S = 0.2
+
+# Served pages poll this path and reload when the build number changes
+BUILD_STATUS_PATH = '/__build'
+RELOAD_SCRIPT = (
+    '<script>(function () {'
+    'var build = null;'
+    'setInterval(function () {'
+    f'fetch("{BUILD_STATUS_PATH}").then(function (r) {{ return r.json(); }}).then(function (s) {{'
+    'if (build !== null && s.build !== build) { location.reload(); }'
+    'build = s.build;'
+    '}).catch(function () {});'
+    '}, 500);'
+    '})();</script>'
+)
+
+DATA_PAGES = ['index', 'full-data', 'user-summary', 'two-week-summary', 'lifts']
+
+
+# (mtime, size) of every watched file; None for files that do not exist
+def scan(paths):
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            state[path] = None
+    return state
+
+
+# Block until a watched file changes and stays unchanged for DEBOUNCE_S; returns the changed paths
+def wait_for_changes(paths, known):
+    current = scan(paths)
+    while current == known:
+        time.sleep(POLL_S)
+        current = scan(paths)
+    while True:
+        time.sleep(DEBOUNCE_S)
+        latest = scan(paths)
+        if latest == current:
+            break
+        current = latest
+    return [path for path in paths if current[path] != known[path]], current
+
+
+# Re-import the generator. Modules import names from each other, so every loaded
+# generator module is dropped and imported afresh rather than reloaded in place.
+def reload_generator(paths):
+    paths = set(paths)
+    for name, module in list(sys.modules.items()):
+        if module is not sys.modules[__name__] and getattr(module, '__file__', None) in paths:
+            del sys.modules[name]
+    return importlib.import_module('generate_html')
+
+
+class Watcher:
+    def __init__(self, args):
+        self.args = args
+        self.csv_path = args.source or DEFAULT_CSV_PATH
+        self.page_names = args.page or None
+        self.build_number = 0
+        self.generate_html = importlib.import_module('generate_html')
+        if self.page_names is None:
+            self.page_names = list(self.generate_html.PAGE_NAMES)
+
+        self.modules = self.generate_html.generator_modules()
+        self.paths = [self.csv_path, args.fleet] + ASSET_FILES + self.modules
+
+    # Pages to rebuild for a set of changed paths, and whether the generator must be reloaded first
+    def affected(self, changed):
+        pages, reload = set(), False
+        for path in changed:
+            if path in self.modules:
+                # The generator hash changes, so the manifest marks every page stale
+                reload = True
+                pages.update(self.page_names)
+            elif path in (self.csv_path, self.args.fleet):
+                # The manifest skips every page whose own columns did not change
+                pages.update(DATA_PAGES)
+            elif self.args.optimize:
+                # A new hashed asset name changes the generator hash
+                pages.update(self.page_names)
+        return [name for name in self.page_names if name in pages], reload
+
+    def build(self, page_names):
+        started = time.perf_counter()
+        try:
+            self.generate_html.SiteBuild(self.args).run(page_names)
+        except Exception:
+            traceback.print_exc()
+            print("Build failed; waiting for the next change")
+            return False
+        print(f"Rebuilt in {time.perf_counter() - started:.2f}s")
+        return True
+
+    def rebuild(self, changed):
+        print(f"Changed: {', '.join(os.path.relpath(path) for path in changed)}")
+        page_names, reload = self.affected(changed)
+        if reload:
+            try:
+                self.generate_html = reload_generator(self.modules)
+            except Exception:
+                traceback.print_exc()
+                print("Reload failed; waiting for the next change")
+                return
+        if page_names and not self.build(page_names):
+            return
+        # Stylesheet and script edits need no rebuild unless --optimize hashes them
+        self.build_number += 1
+
+    def run(self, server=None):
+        known = scan(self.paths)
+        self.build(self.page_names)
+        self.build_number += 1
+        print(f"Watching {self.csv_path}, {self.args.fleet}, {', '.join(ASSET_FILES)} and the generator modules; "
+              "Ctrl+C to stop")
+        try:
+            while True:
+                changed, known = wait_for_changes(self.paths, known)
+                self.rebuild(changed)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        finally:
+            if server is not None:
+                server.shutdown()
+        return 0
+
+
+# Serves the output directory; HTML pages get a script that reloads them after each build
+class PreviewHandler(SimpleHTTPRequestHandler):
+    watcher = None
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == BUILD_STATUS_PATH:
+            self.send_body(json.dumps({'build': self.watcher.build_number}).encode(), 'application/json')
+            return
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path) and path.endswith('/'):
+            file_path = os.path.join(file_path, 'index.html')
+        if not file_path.endswith('.html') or not os.path.isfile(file_path):
+            super().do_GET()
+            return
+        with open(file_path, 'rb') as f:
+            html = f.read()
+        end = html.rfind(b'</body>')
+        if end != -1:
+            html = html[:end] + RELOAD_SCRIPT.encode() + html[end:]
+        self.send_body(html, 'text/html; charset=utf-8')
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(watcher, bind, port):
+    handler = type('Handler', (PreviewHandler,), {'watcher': watcher})
+    server = ThreadingHTTPServer((bind, port), partial(handler, directory=os.getcwd()))
+    threading.Thread(target=server.serve_forever, name='preview-server', daemon=True).start()
+    print(f"Serving the site at http://{bind}:{port}/")
+    return server
+
+
+# `generate_html.py watch|serve`: build once, then rebuild the pages affected by each change
+def watch(args, serve=False):
+    if args.source and is_url(args.source):
+        print("watch needs a local CSV; pass --source PATH", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.source or DEFAULT_CSV_PATH):
+        print(f"{args.source or DEFAULT_CSV_PATH} not found; pass --source PATH", file=sys.stderr)
+        return 2
+    watcher = Watcher(args)
+    server = start_server(watcher, args.bind, args.port) if serve else None
+    return watcher.run(server)
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from collections import Counter
+
+# Registered lifts and the variant IDs submitted for them, e.g. a model suffix
+# typed into the form. Rows for IDs that are neither a lift nor an alias are
+# left out of every page.
+DEFAULT_REGISTRY_PATH = 'data/fleet.json'
+
+
+# The fleet registry: canonical lift IDs in display order and alias -> lift ID
+class FleetRegistry:
+    def __init__(self, lifts, source=DEFAULT_REGISTRY_PATH):
+        self.lift_ids = []
+        self.aliases = {}
+        self.lift_aliases = {}
+        for lift in lifts:
+            lift_id = lift.get('id') if isinstance(lift, dict) else None
+            if not isinstance(lift_id, str) or not lift_id.strip():
+                raise ValueError(f"{source}: every lift needs a non-empty string 'id', got {lift!r}")
+            self.lift_ids.append(lift_id)
+            for alias in lift.get('aliases', []):
+                if alias in self.aliases:
+                    raise ValueError(f"{source}: alias {alias!r} is listed for both "
+                                     f"{self.aliases[alias]} and {lift_id}")
+                self.aliases[alias] = lift_id
+                self.lift_aliases.setdefault(lift_id, []).append(alias)
+        duplicates = sorted(lift_id for lift_id, count in Counter(self.lift_ids).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"{source}: lift(s) listed twice: {', '.join(duplicates)}")
+        clashes = sorted(set(self.aliases) & set(self.lift_ids))
+        if clashes:
+            raise ValueError(f"{source}: alias(es) also registered as lifts: {', '.join(clashes)}")
+
+    # Every ID a submission may carry for a registered lift
+    @property
+    def known_ids(self):
+        return self.lift_ids + list(self.aliases)
+
+    # Alias IDs of each lift, for merging per-ID state
+    def variants(self, lift_id):
+        return self.lift_aliases.get(lift_id, [])
+
+    # Replace alias IDs by their lift's ID. Categorical columns are remapped through
+    # their categories, so the cost does not grow with the number of rows.
+    def canonical_ids(self, series):
+        import numpy as np
+        import pandas as pd
+
+        if not self.aliases:
+            return series
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        labels = [self.aliases.get(label, label) for label in series.cat.categories]
+        categories = pd.unique(pd.Series(labels, dtype=object))
+        positions = pd.Index(categories).get_indexer(labels)
+        codes = series.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, positions[codes], -1)
+        return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+    # Row counts of submitted IDs that are not registered, most frequent first
+    def unregistered(self, series):
+        counts = series.value_counts()
+        counts = counts[(counts > 0) & ~counts.index.isin(self.known_ids)]
+        return {str(lift_id): int(count) for lift_id, count in counts.items()}
+
+    # Identifies the registry contents for the build manifest
+    def digest(self):
+        content = json.dumps([self.lift_ids, self.aliases], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+
+def load_registry(path=DEFAULT_REGISTRY_PATH):
+    with open(path) as f:
+        config = json.load(f)
+    return FleetRegistry(config.get('lifts', []), path)
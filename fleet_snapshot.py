@@ -0,0 +1,292 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from data_source import CACHE_DIR, DEFAULT_CSV_PATH, FLAG_COLUMNS, TRUE_VALUES, file_digest, parse_local_time
+
+# Per-lift fleet state kept next to the CSV, so the index page can be rebuilt
+# right after a submission without reading the whole history
+DEFAULT_SNAPSHOT_PATH = 'data/fleet-state.json'
+SNAPSHOT_VERSION = 2
+
+# Same columns as fleet_state, which imports pandas; ingest.py must not
+VALUE_COLUMNS = ['Name', 'Hours', 'Oil Level', 'Gas Level', 'General Issues']
+EVENT_COLUMNS = ['Last Maintenance'] + FLAG_COLUMNS
+
+# Snapshot entries per lift:
+#   'Completion time': time of the latest submission
+#   value columns: [time, value] of the latest non-empty value
+#   event columns: time of the latest event of that kind
+#   'Oil Change Hours': Hours reported with the latest oil change
+# Times are ISO strings, so they compare in time order. Ties go to the row
+# applied last, as the stable sort in compute_fleet_state gives them to the
+# row later in the file.
+
+
+def empty_entry():
+    entry = {'Completion time': None, 'Oil Change Hours': None}
+    entry.update({col: None for col in VALUE_COLUMNS + EVENT_COLUMNS})
+    return entry
+
+
+def parse_time(text):
+    return parse_local_time(text).isoformat()
+
+
+# A CSV row (as ingest writes it) with the fills prepare_valid_df applies
+def typed_row(row):
+    hours = row.get('Hours', '')
+    typed = {
+        'Boom Lift ID': row.get('Boom Lift ID') or None,
+        'Completion time': parse_time(row['Completion time']) if row.get('Completion time') else None,
+        'Hours': int(float(hours)) if hours else 0,
+        'General Issues': row.get('General Issues', ''),
+        'Maintenance Work': row.get('Maintenance Work', ''),
+    }
+    for col in ['Name', 'Oil Level', 'Gas Level']:
+        typed[col] = row.get(col) or None
+    for col in FLAG_COLUMNS:
+        typed[col] = str(row.get(col, '')).strip().lower() in TRUE_VALUES
+    return typed
+
+
+def is_newer(time, current):
+    return current is None or time >= current
+
+
+# Merge one typed submission into its lift's entry in O(1)
+def apply_row(snapshot, row):
+    lift_id, time = row['Boom Lift ID'], row['Completion time']
+    if lift_id is None or time is None:
+        return
+    entry = snapshot['lifts'].setdefault(lift_id, empty_entry())
+    if is_newer(time, entry['Completion time']):
+        entry['Completion time'] = time
+    for col in VALUE_COLUMNS:
+        if row[col] is not None and (entry[col] is None or time >= entry[col][0]):
+            entry[col] = [time, row[col]]
+
+    maintenance = bool(row['Maintenance Work']) or any(row[col] for col in FLAG_COLUMNS)
+    if maintenance and is_newer(time, entry['Last Maintenance']):
+        entry['Last Maintenance'] = time
+    for col in FLAG_COLUMNS:
+        if row[col] and is_newer(time, entry[col]):
+            entry[col] = time
+            if col == 'Oil Change':
+                entry['Oil Change Hours'] = row['Hours']
+
+
+def load_snapshot(path=DEFAULT_SNAPSHOT_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        snapshot = json.load(f)
+    return snapshot if snapshot.get('version') == SNAPSHOT_VERSION else None
+
+
+def save_snapshot(snapshot, path=DEFAULT_SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# The snapshot matches the CSV as long as nothing but ingest has appended to it.
+# The size rules most edits out cheaply; the content hash catches same-size edits
+# such as a corrected cost, flag or time.
+def is_fresh(snapshot, csv_path):
+    return (snapshot is not None and os.path.exists(csv_path)
+            and snapshot.get('csv_size') == os.path.getsize(csv_path)
+            and snapshot.get('csv_digest') == file_digest(csv_path))
+
+
+# Hex sha256 of the file's first size bytes and of the whole file, in one read
+def prefix_digests(path, size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        remaining = size
+        while remaining:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+        prefix = digest.hexdigest()
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return prefix, digest.hexdigest()
+
+
+# Content hash of the per-lift state, for the build manifest
+def snapshot_digest(snapshot):
+    return hashlib.sha256(json.dumps(snapshot['lifts'], sort_keys=True).encode()).hexdigest()
+
+
+# Called by ingest after appending rows: csv_size_before is the CSV size the
+# snapshot must have been taken at, and the CSV's first csv_size_before bytes must
+# still hash to the snapshot's digest. A missing or stale snapshot is left for
+# the next replay. Returns whether the snapshot was updated.
+def record_append(rows, csv_path, csv_size_before, path=DEFAULT_SNAPSHOT_PATH):
+    snapshot = load_snapshot(path)
+    if snapshot is None or snapshot.get('csv_size') != csv_size_before:
+        return False
+    digest_before, digest_after = prefix_digests(csv_path, csv_size_before)
+    if snapshot.get('csv_digest') != digest_before:
+        return False
+    for row in rows:
+        apply_row(snapshot, typed_row(row))
+    snapshot['rows'] += len(rows)
+    snapshot['csv_size'] = os.path.getsize(csv_path)
+    snapshot['csv_digest'] = digest_after
+    save_snapshot(snapshot, path)
+    return True
+
+
+def iso(value):
+    return None if value is None or value != value else value.isoformat()
+
+
+# Snapshot entries per submitted lift ID from a prepared frame in one vectorised pass
+def state_entries(df):
+    from fleet_state import compute_fleet_state
+
+    lift_ids = sorted(df['Boom Lift ID'].dropna().astype(str).unique())
+    state = compute_fleet_state(df, lift_ids, value_times=True)
+    lifts = {}
+    for record in state.astype(object).where(state.notna(), None).to_dict('records'):
+        entry = empty_entry()
+        entry['Completion time'] = iso(record['Completion time'])
+        for col in VALUE_COLUMNS:
+            if record[col] is not None:
+                value = int(record[col]) if col == 'Hours' else record[col]
+                entry[col] = [iso(record[f'{col} at']), value]
+        for col in EVENT_COLUMNS:
+            entry[col] = iso(record[col])
+        if record['Oil Change Hours'] is not None:
+            entry['Oil Change Hours'] = int(record['Oil Change Hours'])
+        lifts[record['Boom Lift ID']] = entry
+    return lifts
+
+
+# Full replay: build the snapshot from the full log
+def replay(df, csv_path):
+    return {
+        'version': SNAPSHOT_VERSION,
+        'csv_size': os.path.getsize(csv_path),
+        'csv_digest': file_digest(csv_path),
+        'rows': len(df),
+        'lifts': state_entries(df),
+    }
+
+
+# One entry for a lift submitted under several IDs (fleet registry aliases). On
+# equal times the first entry given wins, as file order is not recorded.
+def merge_entries(entries):
+    merged = empty_entry()
+    for entry in entries:
+        for col in ['Completion time'] + EVENT_COLUMNS:
+            if entry[col] is not None and (merged[col] is None or entry[col] > merged[col]):
+                merged[col] = entry[col]
+                if col == 'Oil Change':
+                    merged['Oil Change Hours'] = entry['Oil Change Hours']
+        for col in VALUE_COLUMNS:
+            if entry[col] is not None and (merged[col] is None or entry[col][0] > merged[col][0]):
+                merged[col] = entry[col]
+    return merged
+
+
+# Fold the entries of a later part of the log into lifts; on equal times the later
+# part wins, as it would in one pass over the whole log
+def merge_states(lifts, later):
+    for lift_id, entry in later.items():
+        lifts[lift_id] = merge_entries([entry, lifts[lift_id]]) if lift_id in lifts else entry
+    return lifts
+
+
+# The snapshot as the frame compute_fleet_state returns, for format_boom_summary.
+# Entries are kept per submitted ID; with a registry, aliases are merged into their lift.
+def snapshot_state(snapshot, lift_ids, registry=None):
+    import pandas as pd
+
+    records = []
+    for lift_id in lift_ids:
+        ids = [lift_id] + (registry.variants(lift_id) if registry is not None else [])
+        entries = [snapshot['lifts'][i] for i in ids if i in snapshot['lifts']]
+        entry = entries[0] if len(entries) == 1 else merge_entries(entries)
+        record = {'Boom Lift ID': lift_id, 'Completion time': entry['Completion time']}
+        for col in VALUE_COLUMNS:
+            record[col] = entry[col][1] if entry[col] is not None else None
+        for col in EVENT_COLUMNS:
+            record[col] = entry[col]
+        record['Oil Change Hours'] = entry['Oil Change Hours']
+        records.append(record)
+    state = pd.DataFrame.from_records(records, columns=list(records[0]) if records else None)
+    for col in ['Completion time'] + EVENT_COLUMNS:
+        state[col] = pd.to_datetime(state[col])
+    for col in ['Hours', 'Oil Change Hours']:
+        state[col] = state[col].astype('Float64')
+    return state
+
+
+# Lift IDs whose index-page row differs between the snapshot and a from-scratch computation
+def check(snapshot, df, lift_ids):
+    from fleet_state import compute_fleet_state, format_boom_summary
+
+    expected = format_boom_summary(compute_fleet_state(df, lift_ids)).astype(str)
+    actual = format_boom_summary(snapshot_state(snapshot, lift_ids)).astype(str)
+    columns = [col for col in expected.columns if col != 'Oil Change Hours']
+    differs = (expected[columns].to_numpy() != actual[columns].to_numpy()).any(axis=1)
+    return [lift_id for lift_id, bad in zip(lift_ids, differs) if bad]
+
+
+def load_prepared(csv_path, cache_dir=CACHE_DIR):
+    from data_source import load_csv
+    from fleet_state import FLEET_COLUMNS
+    from site_data import prepare_valid_df
+
+    df = load_csv(csv_path, cache_dir, FLEET_COLUMNS)
+    return prepare_valid_df(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maintain the per-lift fleet state snapshot.')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help=f'Submission log (default: {DEFAULT_CSV_PATH})')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT_PATH,
+                        help=f'Snapshot path (default: {DEFAULT_SNAPSHOT_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the parsed-frame cache')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('replay', help='Rebuild the snapshot from the full submission log')
+    check_command = commands.add_parser('check', help='Compare the snapshot with a from-scratch computation')
+    check_command.add_argument('--repair', action='store_true', help='Replay the snapshot if the check fails')
+    args = parser.parse_args(argv)
+
+    df = load_prepared(args.csv, None if args.no_cache else CACHE_DIR)
+    if args.command == 'replay':
+        save_snapshot(replay(df, args.csv), args.snapshot)
+        print(f"Replayed {len(df)} submission(s) into {args.snapshot}")
+        return 0
+
+    snapshot = load_snapshot(args.snapshot)
+    if snapshot is None:
+        problems = ['snapshot missing or from another version']
+    else:
+        lift_ids = sorted(set(df['Boom Lift ID'].astype(str)) | set(snapshot['lifts']))
+        problems = [f'lift {lift_id} differs' for lift_id in check(snapshot, df, lift_ids)]
+        if not is_fresh(snapshot, args.csv):
+            problems.append('CSV changed since the snapshot was updated')
+    if not problems:
+        print(f"Fleet snapshot matches {args.csv}")
+        return 0
+    for problem in problems:
+        print(f"Fleet snapshot: {problem}", file=sys.stderr)
+    if args.repair:
+        save_snapshot(replay(df, args.csv), args.snapshot)
+        print(f"Replayed {len(df)} submission(s) into {args.snapshot}")
+        return 0
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
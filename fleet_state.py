@@ -0,0 +1,63 @@
+import pandas as pd
+from data_source import FLAG_COLUMNS
+
+# Maintenance flags (FLAG_COLUMNS) are tracked per lift, each shown as the date it last happened
+
+# Columns taken from each lift's latest submission
+STATUS_COLUMNS = ['Completion time', 'Name', 'Hours', 'Oil Level', 'Gas Level', 'General Issues']
+
+# Every column compute_fleet_state reads
+FLEET_COLUMNS = ['Boom Lift ID', 'Maintenance Work'] + STATUS_COLUMNS + FLAG_COLUMNS
+
+NO_DATA = 'No Data Available'
+
+
+# Per-lift state from one time sort and one grouped pass over the submissions.
+# Event columns hold the time of the lift's last event of that kind (NaT if none),
+# status columns the last non-null value, matching groupby().last() semantics.
+# With value_times, '<column> at' columns also hold the time of each status value,
+# which fleet_snapshot needs to merge later submissions into the state.
+def compute_fleet_state(df, lift_ids, value_times=False):
+    ordered = df.sort_values('Completion time', kind='stable')
+    time = ordered['Completion time']
+    flags = {col: ordered[col].fillna(False).astype(bool) for col in FLAG_COLUMNS}
+
+    work = ordered['Maintenance Work']
+    any_maintenance = work.notna() & (work != '')
+    for mask in flags.values():
+        any_maintenance = any_maintenance | mask
+
+    events = {'Boom Lift ID': ordered['Boom Lift ID']}
+    for col in STATUS_COLUMNS:
+        events[col] = ordered[col]
+    events['Last Maintenance'] = time.where(any_maintenance)
+    for col, mask in flags.items():
+        events[col] = time.where(mask)
+    events['Oil Change Hours'] = ordered['Hours'].where(flags['Oil Change'])
+    if value_times:
+        for col in STATUS_COLUMNS[1:]:
+            events[f'{col} at'] = time.where(ordered[col].notna())
+
+    state = pd.DataFrame(events).groupby('Boom Lift ID', sort=False, observed=True).last()
+    state.index = state.index.astype(object)
+    state = state.reindex(pd.Index(lift_ids, name='Boom Lift ID'))
+    return state.reset_index()
+
+
+def format_date(series):
+    return series.dt.strftime('%Y-%m-%d').fillna(NO_DATA)
+
+
+# Display table for the Latest Boom Lift Summary
+def format_boom_summary(state):
+    summary = state.copy()
+    summary['Hours Since Oil Change'] = [
+        int(hours - oil_hours) if pd.notnull(oil_hours) else 'No Data'
+        for hours, oil_hours in zip(state['Hours'], state['Oil Change Hours'])
+    ]
+    summary['Hours'] = [int(x) if pd.notnull(x) else NO_DATA for x in state['Hours']]
+    for col in ['Completion time', 'Last Maintenance'] + FLAG_COLUMNS:
+        summary[col] = format_date(state[col])
+    for col in ['Name', 'Oil Level', 'Gas Level', 'General Issues']:
+        summary[col] = state[col].astype(object).fillna(NO_DATA)
+    return summary
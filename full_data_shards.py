@@ -0,0 +1,42 @@
+import json
+import os
+from html_table import format_column
+
+# Full-data shards are written here, one JSON file per calendar month
+SHARD_DIR = 'full-data'
+SHARD_INDEX = 'index.json'
+
+
+def to_json(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+# Split the (newest first) full-data frame into per-month slices, keeping row order
+def month_shards(full_data_df):
+    months = full_data_df['Completion time'].dt.strftime('%Y-%m').fillna('undated')
+    for month, rows in full_data_df.groupby(months, sort=False):
+        yield month, f'{month}.json', rows
+
+
+# Cells are formatted and escaped exactly like the HTML table cells
+def shard_json(rows, columns):
+    cells = [format_column(rows[col]) for col in columns]
+    return to_json([list(row) for row in zip(*cells)])
+
+
+# The index lists shards newest first with their row counts, so the client can
+# map a table page onto the shards it needs without loading the others
+def index_json(columns, shards):
+    return to_json({
+        'columns': columns,
+        'total': sum(count for _, count in shards),
+        'shards': [{'file': file, 'rows': count} for file, count in shards],
+    })
+
+
+# Remove shard files (and their compressed siblings) that are no longer listed in the index
+def prune_shards(shard_dir, keep):
+    for name in os.listdir(shard_dir):
+        shard = name[:-len('.gz')] if name.endswith(('.gz', '.br')) else name
+        if shard.endswith('.json') and shard != SHARD_INDEX and shard not in keep:
+            os.remove(os.path.join(shard_dir, name))
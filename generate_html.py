@@ -1,213 +1,67 @@
+import argparse
+import hashlib
+import json
 import os
-import pandas as pd
-import requests
-from io import BytesIO
-from jinja2 import Template
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from html import escape
+from assets import ASSET_FILES, ASSET_HASH_LENGTH
+from data_source import CACHE_DIR, CHUNK_ROWS, CSV_URL, DEFAULT_CSV_PATH
+from fleet_registry import DEFAULT_REGISTRY_PATH, load_registry
+from profiling import Profiler
 
-# GitHub raw CSV URL
-CSV_URL = 'https://raw.githubusercontent.com/MDGeneralContracting/md-maintenance-website/main/data/boom_lift_data.csv'
-response = requests.get(CSV_URL, timeout=10)
-response.raise_for_status()
-df = pd.read_csv(pd.io.common.StringIO(response.text), parse_dates=['Completion time'])
-
-# Fill missing values for new schema
-df['General Issues'] = df['General Issues'].fillna('')
-df['Maintenance Work'] = df['Maintenance Work'].fillna('')
-df['Oil Change'] = df['Oil Change'].fillna(False)
-df['Annual Inspection'] = df['Annual Inspection'].fillna(False)
-df['NDT'] = df['NDT'].fillna(False)
-df['Radiator Repair'] = df['Radiator Repair'].fillna(False)
-df['Other Work'] = df['Other Work'].fillna('')
-for col in ['Oil Change Cost', 'Annual Inspection Cost', 'NDT Cost', 'Radiator Repair Cost', 'Other Work Cost']:
-    df[col] = df[col].fillna(0)
-
-# Define valid boom lift IDs
-valid_boom_lifts = [
-    'B_GNE_001', 'B_GNE_002', 'B_GNE_003', 'B_GNE_004',
-    'B_GNE_005', 'B_GNE_006', 'B_GNE_007', 'B_GNE_008',
-    'B_JLG_001', 'B_SNK_001'
-]
+# pandas, numpy, jinja2 and requests are imported inside the functions that use
+# them, so importing this module, `ingest` and static-only builds stay fast
+
+# Build manifest: maps each output file to the hash of the inputs it was built from
+MANIFEST_PATH = 'build-manifest.json'
 
-# Filter dataframe to only include valid boom lift IDs
-valid_df = df[df['Boom Lift ID'].isin(valid_boom_lifts)].copy()
+# Pay period dropdown entries, loaded by script.js on every summary page
+PERIOD_INDEX = 'periods.json'
 
-# Convert 'Hours' to integer where possible
-valid_df['Hours'] = valid_df['Hours'].apply(lambda x: int(x) if pd.notnull(x) else 0)
+# Shared page shell of --layout fragments builds
+LAYOUT_PATH = 'layout.js'
 
-# Helper function to generate HTML table with a unique ID
-def generate_html_table(df, columns, table_id):
-    headers = ''.join(f'<th>{col}</th>' for col in columns)
-    rows = ''
-    for _, row in df.iterrows():
-        cells = ''.join(f'<td>{row[col]}</td>' for col in columns)
-        rows += f'<tr>{cells}</tr>'
-    return f'<table class="data-table" id="{table_id}"><thead><tr>{headers}</tr></thead><tbody>{rows}</tbody></table>'
+# Pages `build --page` can select; two-week-summary covers every pay period page
+# and lifts every per-lift history page
+PAGE_NAMES = ['index', 'full-data', 'user-summary', 'two-week-summary', 'lifts', 'submit']
+
+# Pages whose totals are sliced from the cost cube (cost_cube.py)
+CUBE_PAGES = ['user-summary', 'two-week-summary', 'lifts']
 
 # Full Data Table with Maintenance Columns
 display_columns = [
-    'Completion time', 'Name', 'Boom Lift ID', 'Builder', 'Site', 'Location', 'Hours', 
-    'Oil Level', 'Gas Level', 'General Issues', 'Maintenance Work', 
-    'Oil Change', 'Oil Change Cost', 'Annual Inspection', 'Annual Inspection Cost', 
+    'Completion time', 'Name', 'Boom Lift ID', 'Builder', 'Site', 'Location', 'Hours',
+    'Oil Level', 'Gas Level', 'General Issues', 'Maintenance Work',
+    'Oil Change', 'Oil Change Cost', 'Annual Inspection', 'Annual Inspection Cost',
     'NDT', 'NDT Cost', 'Radiator Repair', 'Radiator Repair Cost', 'Other Work', 'Other Work Cost'
 ]
-full_data_df = valid_df[display_columns].sort_values('Completion time', ascending=False)
-full_data_table = generate_html_table(full_data_df, display_columns, "full-data-table")
 
 # Boom Lift Summary
 boom_columns = [
     'Boom Lift ID', 'Completion time', 'Name', 'Hours', 'Oil Level', 'Gas Level',
-    'General Issues', 'Last Maintenance', 'Oil Change', 'Hours Since Oil Change', 
+    'General Issues', 'Last Maintenance', 'Oil Change', 'Hours Since Oil Change',
     'Annual Inspection', 'NDT', 'Radiator Repair'
 ]
-boom_lift_summary = pd.DataFrame({'Boom Lift ID': valid_boom_lifts})
-current_status = valid_df.sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-
-# Last Maintenance (any maintenance work)
-last_maintenance = valid_df[
-    valid_df['Maintenance Work'].notna() & (valid_df['Maintenance Work'] != '') |
-    valid_df['Oil Change'] | valid_df['Annual Inspection'] | valid_df['NDT'] | valid_df['Radiator Repair']
-].sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-last_maintenance['Last Maintenance'] = last_maintenance['Completion time'].dt.strftime('%Y-%m-%d')
-
-# Oil Change Tracking
-oil_changes = valid_df[valid_df['Oil Change']].sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-oil_changes['Oil Change'] = oil_changes['Completion time'].dt.strftime('%Y-%m-%d')
-oil_changes['Oil Change Hours'] = oil_changes['Hours'].astype(int)
-
-# Annual Inspection Tracking
-annual_inspections = valid_df[valid_df['Annual Inspection']].sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-annual_inspections['Annual Inspection'] = annual_inspections['Completion time'].dt.strftime('%Y-%m-%d')
-
-# NDT Tracking
-ndt = valid_df[valid_df['NDT']].sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-ndt['NDT'] = ndt['Completion time'].dt.strftime('%Y-%m-%d')
-
-# Radiator Repair Tracking
-radiator_repairs = valid_df[valid_df['Radiator Repair']].sort_values('Completion time').groupby('Boom Lift ID').last().reset_index()
-radiator_repairs['Radiator Repair'] = radiator_repairs['Completion time'].dt.strftime('%Y-%m-%d')
-
-# Merge data into summary
-boom_lift_summary = boom_lift_summary.merge(
-    current_status[['Boom Lift ID', 'Completion time', 'Name', 'Hours', 'Oil Level', 'Gas Level', 'General Issues']],
-    on='Boom Lift ID', how='left'
-).merge(
-    last_maintenance[['Boom Lift ID', 'Last Maintenance']], on='Boom Lift ID', how='left'
-).merge(
-    oil_changes[['Boom Lift ID', 'Oil Change', 'Oil Change Hours']], on='Boom Lift ID', how='left'
-).merge(
-    annual_inspections[['Boom Lift ID', 'Annual Inspection']], on='Boom Lift ID', how='left'
-).merge(
-    ndt[['Boom Lift ID', 'NDT']], on='Boom Lift ID', how='left'
-).merge(
-    radiator_repairs[['Boom Lift ID', 'Radiator Repair']], on='Boom Lift ID', how='left'
-)
-
-# Calculate Hours Since Oil Change
-boom_lift_summary['Hours Since Oil Change'] = boom_lift_summary.apply(
-    lambda row: int(row['Hours'] - row['Oil Change Hours']) if pd.notnull(row['Oil Change Hours']) else 'No Data',
-    axis=1
-)
-
-# Format dates and handle missing data
-boom_lift_summary['Completion time'] = boom_lift_summary['Completion time'].apply(
-    lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else 'No Data Available'
-)
-for col in ['Name', 'Oil Level', 'Gas Level', 'General Issues', 'Last Maintenance', 'Oil Change', 'Annual Inspection', 'NDT', 'Radiator Repair']:
-    boom_lift_summary[col] = boom_lift_summary[col].fillna('No Data Available')
-boom_lift_summary['Hours'] = boom_lift_summary['Hours'].apply(
-    lambda x: int(x) if pd.notnull(x) else 'No Data Available'
-)
-
-# Generate the table
-latest_boom_table = generate_html_table(boom_lift_summary[boom_columns], boom_columns, "latest-boom-table")
 
 # User Summary
-user_summary = valid_df.groupby('Name').agg(
-    submissions=('Completion time', 'count'),
-    latest_submission=('Completion time', 'max'),
-    issues=('General Issues', lambda x: (x != '').sum())
-).reset_index().sort_values('Name')
 user_columns = ['Name', 'submissions', 'latest_submission', 'issues']
-user_summary_table = generate_html_table(user_summary, user_columns, "user-summary-table")
-
-# 2-Week Summary with Dropdown for Pay Periods
-start_date = datetime(2024, 12, 30)  # Initial pay period start date
-today = datetime.now()
-days_diff = (today - start_date).days
-period_number = days_diff // 14
-
-# Generate all pay periods from start_date to current period
-all_start_dates = [start_date + timedelta(days=14 * i) for i in range(period_number + 1)]
-all_start_dates.reverse()  # Most recent first
-
-# Limit to current and previous 10 periods (11 total)
-recent_start_dates = all_start_dates[:11]
-
-# Precompute pay periods with start and end dates
-pay_periods = []
-for start in recent_start_dates:
-    end = start + timedelta(days=13)
-    pay_periods.append({
-        'start': start.strftime('%Y-%m-%d'),
-        'end': end.strftime('%Y-%m-%d'),
-        'filename': f"two-week-summary-{start.strftime('%Y-%m-%d')}.html"
-    })
-
-# Function to generate summary for a given pay period
-def generate_pay_period_summary(start_date):
-    end_date = start_date + timedelta(days=13)
-    period_df = valid_df[
-        (valid_df['Completion time'] >= start_date) &
-        (valid_df['Completion time'] < end_date + timedelta(days=1))
-    ].copy()
-    period_df['Date'] = period_df['Completion time'].dt.date
-
-    # Daily Review Calendar
-    daily_review_html = '<div class="calendar"><div class="calendar-grid">'
-    days = [start_date + timedelta(days=i) for i in range(14)]
-    for day in days:
-        day_group = period_df[period_df['Date'] == day.date()]
-        submissions = ''
-        if not day_group.empty:
-            for name, name_group in day_group.groupby('Name'):
-                boom_lifts = name_group['Boom Lift ID'].tolist()
-                submissions += f'<p><strong>{name}</strong>: {", ".join(boom_lifts)}</p>'
-        else:
-            submissions = '<p class="no-submissions">No submissions</p>'
-        daily_review_html += (
-            f'<div class="calendar-day">'
-            f'<h4>{day.strftime("%a, %b %d")}</h4>'
-            f'{submissions}'
-            f'</div>'
-        )
-    daily_review_html += '</div></div>'
-
-    # Builder Summary
-    builder_summary = period_df.groupby('Builder').agg(
-        completions=('Completion time', 'count'),
-        issues=('General Issues', lambda x: (x != '').sum())
-    ).reset_index() if not period_df.empty else pd.DataFrame(columns=['Builder', 'completions', 'issues'])
-    builder_columns = ['Builder', 'completions', 'issues']
-    builder_summary_table = generate_html_table(builder_summary, builder_columns, "builder-summary-table")
-
-    return daily_review_html, builder_summary_table
 
-# Base Template without Dropdown (for non-summary pages)
-base_template_no_dropdown = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>M&D General Contracting - {{ page_title }}</title>
-    <link rel="stylesheet" href="style.css">
+# Stylesheets and scripts every page loads
+head_assets_template = """
+    <link rel="stylesheet" href="{{ assets['style.css'] }}">
     <link rel="stylesheet" href="https://cdn.datatables.net/1.13.6/css/jquery.dataTables.min.css">
     <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
     <script src="https://cdn.datatables.net/1.13.6/js/jquery.dataTables.min.js"></script>
-    <script src="script.js" defer></script>
-</head>
-<body>
+    <script src="{{ assets['script.js'] }}" defer></script>
+"""
+
+# Site header and navigation
+site_header_template = """
     <header>
         <img src="M&D General Contracting_E4_Cropped.png" alt="M&D Logo" class="logo">
         <h1>M&D General Contracting</h1>
@@ -221,6 +75,37 @@ base_template_no_dropdown = """
             </ul>
         </nav>
     </header>
+"""
+
+# Pay period dropdown of the summary pages; script.js fills it from the period index
+period_selector_template = """
+        <div class="pay-period-selector">
+            <label for="pay-period-select">Select Pay Period: </label>
+            <select id="pay-period-select" data-periods="{{ period_index }}">
+                <option value="{{ period.filename }}" selected>
+                    {{ period.start }} to {{ period.end }}
+                </option>
+            </select>
+            <script>
+                document.getElementById('pay-period-select').addEventListener('change', function() {
+                    window.location.href = this.value;
+                });
+            </script>
+        </div>
+"""
+
+# Base Template without Dropdown (for non-summary pages)
+base_template_no_dropdown = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>M&D General Contracting - {{ page_title }}</title>
+{%- include 'head_assets' %}
+</head>
+<body>
+{%- include 'site_header' %}
     <main>
         {{ content | safe }}
     </main>
@@ -236,100 +121,69 @@ base_template_with_dropdown = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>M&D General Contracting - {{ page_title }}</title>
-    <link rel="stylesheet" href="style.css">
-    <link rel="stylesheet" href="https://cdn.datatables.net/1.13.6/css/jquery.dataTables.min.css">
-    <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
-    <script src="https://cdn.datatables.net/1.13.6/js/jquery.dataTables.min.js"></script>
-    <script src="script.js" defer></script>
+{%- include 'head_assets' %}
 </head>
 <body>
-    <header>
-        <img src="M&D General Contracting_E4_Cropped.png" alt="M&D Logo" class="logo">
-        <h1>M&D General Contracting</h1>
-        <nav>
-            <ul>
-                <li><a href="index.html">Home</a></li>
-                <li><a href="full-data.html">Full Data</a></li>
-                <li><a href="user-summary.html">User Summary</a></li>
-                <li><a href="two-week-summary.html">2-Week Summary</a></li>
-                <li><a href="submit.html">Submit Data</a></li>
-            </ul>
-        </nav>
-    </header>
+{%- include 'site_header' %}
     <main>
-        <div class="pay-period-selector">
-            <label for="pay-period-select">Select Pay Period: </label>
-            <select id="pay-period-select">
-                {% for period in pay_periods %}
-                <option value="{{ period.filename }}"
-                        {% if period.start == current_start_date %}selected{% endif %}>
-                    {{ period.start }} to {{ period.end }}
-                </option>
-                {% endfor %}
-            </select>
-            <script>
-                document.getElementById('pay-period-select').addEventListener('change', function() {
-                    window.location.href = this.value;
-                });
-            </script>
-        </div>
+{%- include 'period_selector' %}
         {{ content | safe }}
     </main>
 </body>
 </html>
 """
 
-# Generate pages for each pay period
-for i, start_date in enumerate(recent_start_dates):
-    print(f"Generating file: two-week-summary-{start_date.strftime('%Y-%m-%d')}.html")
-    daily_review_html, builder_summary_table = generate_pay_period_summary(start_date)
-    end_date = start_date + timedelta(days=13)
-    content = f"""
-        <h2>2-Week Summary ({start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')})</h2>
-        <h3>Daily Review</h3>
-        {daily_review_html}
-        <h3>Builder Summary</h3>
-        <div class="table-container">{builder_summary_table}</div>
-    """
-    filename = f"two-week-summary-{start_date.strftime('%Y-%m-%d')}.html"
-    current_start_date = start_date.strftime('%Y-%m-%d')  # Specific to this page
-    
-    html_content = Template(base_template_with_dropdown).render(
-        page_title=f'2-Week Summary ({start_date.strftime("%Y-%m-%d")})',
-        content=content,
-        pay_periods=pay_periods,
-        current_start_date=current_start_date
-    )
-    with open(filename, 'w') as f:
-        f.write(html_content)
-    print(f"Successfully wrote: {filename}")
-
-# Save the current period to two-week-summary.html
-print("Generating file: two-week-summary.html")
-latest_start_date = recent_start_dates[0].strftime('%Y-%m-%d')  # Current period
-daily_review_html, builder_summary_table = generate_pay_period_summary(recent_start_dates[0])
-end_date = recent_start_dates[0] + timedelta(days=13)
-current_content = f"""
-    <h2>2-Week Summary ({latest_start_date} to {end_date.strftime('%Y-%m-%d')})</h2>
-    <h3>Daily Review</h3>
-    {daily_review_html}
-    <h3>Builder Summary</h3>
-    <div class="table-container">{builder_summary_table}</div>
+# Page of a --layout fragments build: the title, the page's own content and the
+# shared shell script, which adds the head assets and site header (layout_template)
+base_template_fragment = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>M&D General Contracting - {{ page_title }}</title>
+    <script src="{{ layout }}"></script>
+</head>
+<body>
+    <main>
+{%- if period %}{% include 'period_selector' %}{% endif %}
+        {{ content | safe }}
+    </main>
+</body>
+</html>
 """
-with open('two-week-summary.html', 'w') as f:
-    f.write(Template(base_template_with_dropdown).render(
-        page_title='2-Week Summary (Current)',
-        content=current_content,
-        pay_periods=pay_periods,
-        current_start_date=latest_start_date
-    ))
-print("Successfully wrote: two-week-summary.html")
-
-# Generate other pages without dropdown
-pages = {
-    'submit.html': {
-        'page_title': 'Submit Boom Lift Data',
-        'content': '''
+
+# Shared shell (LAYOUT_PATH) of a --layout fragments build, loaded from each page's head
+layout_template = """
+(function() {
+    const head = {{ head | tojson }};
+    const header = {{ header | tojson }};
+
+    // Markup-inserted scripts never run, so each is re-created; async=false keeps their order
+    const assets = document.createElement('template');
+    assets.innerHTML = head;
+    assets.content.querySelectorAll('link, script').forEach(function(element) {
+        if (element.tagName === 'SCRIPT') {
+            const script = document.createElement('script');
+            script.src = element.getAttribute('src');
+            script.async = false;
+            document.head.appendChild(script);
+        } else {
+            element.setAttribute('blocking', 'render');
+            document.head.appendChild(element);
+        }
+    });
+
+    // Runs before script.js's ready handler, which is registered once jQuery has loaded
+    document.addEventListener('DOMContentLoaded', function() {
+        document.body.insertAdjacentHTML('afterbegin', header);
+    });
+})();
+"""
+
+# Submission form page; built without loading any data. Its Boom Lift ID options
+# are filled in from the fleet registry by submit_page_content.
+submit_content = '''
             <h2>Submit Boom Lift Data</h2>
             <form id="boom-lift-form" method="POST">
                 <label for="role">Role:</label><br>
@@ -360,16 +214,7 @@ pages = {
                     <label for="boom-lift-id">Boom Lift ID:</label><br>
                     <select id="boom-lift-id" name="Boom Lift ID" required onchange="updateHoursValidation()">
                         <option value="">Select Boom Lift</option>
-                        <option value="B_GNE_001">B_GNE_001</option>
-                        <option value="B_GNE_002">B_GNE_002</option>
-                        <option value="B_GNE_003">B_GNE_003</option>
-                        <option value="B_GNE_004">B_GNE_004</option>
-                        <option value="B_GNE_005">B_GNE_005</option>
-                        <option value="B_GNE_006">B_GNE_006</option>
-                        <option value="B_GNE_007">B_GNE_007</option>
-                        <option value="B_GNE_008">B_GNE_008</option>
-                        <option value="B_JLG_001">B_JLG_001</option>
-                        <option value="B_SNK_001">B_SNK_001</option>
+{lift_options}
                     </select><br><br>
 
                     <label for="builder">Builder:</label><br>
@@ -431,16 +276,7 @@ pages = {
                     <label for="mechanic-boom-lift-id">Boom Lift ID:</label><br>
                     <select id="mechanic-boom-lift-id" name="Boom Lift ID" required onchange="updateHoursValidation()">
                         <option value="">Select Boom Lift</option>
-                        <option value="B_GNE_001">B_GNE_001</option>
-                        <option value="B_GNE_002">B_GNE_002</option>
-                        <option value="B_GNE_003">B_GNE_003</option>
-                        <option value="B_GNE_004">B_GNE_004</option>
-                        <option value="B_GNE_005">B_GNE_005</option>
-                        <option value="B_GNE_006">B_GNE_006</option>
-                        <option value="B_GNE_007">B_GNE_007</option>
-                        <option value="B_GNE_008">B_GNE_008</option>
-                        <option value="B_JLG_001">B_JLG_001</option>
-                        <option value="B_SNK_001">B_SNK_001</option>
+{lift_options}
                     </select><br><br>
 
                     <label for="mechanic-builder">Builder:</label><br>
@@ -514,43 +350,875 @@ pages = {
             </form>
             <p id="submission-message" style="display: none;">Submission successful!</p>
         '''
-    },
-    'index.html': {
-        'page_title': 'Home',
-        'content': (
-            '<div class="summary">'
-            '<h2>Welcome</h2>'
-            '<p>This website tracks boom lift information submitted daily by M&D General Contracting\'s installers, '
-            'providing real-time insights into equipment usage and maintenance needs.</p>'
-            '</div>'
-            '<h2>Latest Boom Lift Summary</h2>'
-            '<div class="table-container">' + latest_boom_table + '</div>'
+
+
+def submit_page_content(lift_ids):
+    options = '\n'.join(f'                        <option value="{escape(lift_id)}">{escape(lift_id)}</option>'
+                         for lift_id in lift_ids)
+    return submit_content.format(lift_options=options)
+
+# Search box above the full data table; script.js fetches the search index on first use
+search_box_content = '''
+            <section class="issue-search" data-index="{index}">
+                <h3>Search Issues and Maintenance</h3>
+                <div class="issue-search-controls">
+                    <input type="search" id="issue-search-input" placeholder="e.g. hydraulic leak" autocomplete="off">
+                    <select id="issue-search-lift"><option value="">All lifts</option></select>
+                    <select id="issue-search-month"><option value="">All months</option></select>
+                </div>
+                <p id="issue-search-status"></p>
+                <div class="table-container" id="issue-search-results" hidden>{table}</div>
+            </section>
+        '''
+
+# Content is either a string or a (before, chunks, after) tuple to stream
+STREAM_MARKER = '<!-- stream -->'
+
+
+# The generator's modules: this script and every helper module next to it. Pages
+# are rendered by the helpers too (html_table, pay_periods, lift_history, ...).
+def generator_modules():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.py'))
+
+
+# Hash of the generator's modules covers the templates and the rendering logic
+def generator_hash():
+    digest = hashlib.sha256()
+    for path in generator_modules():
+        with open(path, 'rb') as f:
+            digest.update(os.path.basename(path).encode() + b'\0' + hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+# Content hash of a dataframe slice (values and column names, not the index)
+def frame_digest(frame):
+    import pandas as pd
+
+    digest = hashlib.sha256(','.join(frame.columns).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+# Templates are compiled once per build; compiled bytecode is cached on disk between builds.
+# assets maps style.css/script.js to the names pages should reference.
+def load_templates(cache_dir=CACHE_DIR, assets=None):
+    from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+    bytecode_cache = None
+    if cache_dir is not None:
+        os.makedirs(os.path.join(cache_dir, 'jinja'), exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(os.path.join(cache_dir, 'jinja'))
+    templates = Environment(
+        loader=DictLoader({
+            'no_dropdown': base_template_no_dropdown,
+            'with_dropdown': base_template_with_dropdown,
+            'fragment': base_template_fragment,
+            'layout': layout_template,
+            'head_assets': head_assets_template,
+            'site_header': site_header_template,
+            'period_selector': period_selector_template,
+        }),
+        bytecode_cache=bytecode_cache,
+    )
+    templates.globals['assets'] = assets or {name: name for name in ASSET_FILES}
+    return templates
+
+
+# Submission columns each page reads; a build loads only the union for its pages
+def page_columns(name):
+    # Only the selected page's module is imported: most of them load pandas
+    if name == 'index':
+        from fleet_state import FLEET_COLUMNS
+        return FLEET_COLUMNS
+    if name == 'full-data':
+        return display_columns
+    if name == 'user-summary':
+        from site_data import USER_SUMMARY_COLUMNS
+        return USER_SUMMARY_COLUMNS
+    if name == 'two-week-summary':
+        from pay_periods import PERIOD_COLUMNS
+        return PERIOD_COLUMNS
+    if name == 'lifts':
+        from lift_history import LIFT_COLUMNS
+        return LIFT_COLUMNS
+    return []
+
+
+# Dropdown entries for the listed pay periods, most recent first
+def pay_period_options(start_dates):
+    pay_periods = []
+    for start in start_dates:
+        end = start + timedelta(days=13)
+        pay_periods.append({
+            'start': start.strftime('%Y-%m-%d'),
+            'end': end.strftime('%Y-%m-%d'),
+            'filename': f"two-week-summary-{start.strftime('%Y-%m-%d')}.html"
+        })
+    return pay_periods
+
+
+# One run of the generator: the loaded data, the manifest and the page-writer pool
+class SiteBuild:
+    def __init__(self, args):
+        self.args = args
+        # Per-stage instrumentation; a no-op unless --profile or --profile-dump is given
+        self.profiler = Profiler(enabled=bool(args.profile), cprofile=bool(args.profile_dump))
+        self.stage = self.profiler.stage
+        self.source = args.source or (DEFAULT_CSV_PATH if os.path.exists(DEFAULT_CSV_PATH) else CSV_URL)
+        self.valid_df = None
+        # SQLite backend: the whole table, queried once by the first page that needs it
+        self.all_rows = None
+        # With --stream, the aggregates of a chunked pass take the place of valid_df
+        self.stream = None
+        self.cube = None
+        self.store = None
+        self.fleet_snapshot = None
+        self.store_lock = threading.Lock()
+        # Registered lifts and their aliases; other IDs are left out of every page
+        self.registry = load_registry(args.fleet)
+
+        # --optimize references content-hashed copies of style.css and script.js
+        assets = None
+        if args.optimize:
+            from assets import brotli_module, publish_assets
+            if brotli_module() is None:
+                print("brotli is not installed; writing .gz files only")
+            assets = publish_assets()
+        # Output options change every page, so they are part of the generator hash
+        self.generator_hash = hashlib.sha256(
+            json.dumps([generator_hash(), args.optimize, args.layout, assets], sort_keys=True).encode()
+        ).hexdigest()
+
+        # Partial builds keep the other pages' entries; --force only disables skipping
+        self.manifest = {}
+        if os.path.exists(MANIFEST_PATH):
+            with open(MANIFEST_PATH) as f:
+                self.manifest = json.load(f)
+        self.skipped_pages = []
+
+        # Pages are rendered and written on a thread pool; queue_page schedules one
+        self.page_pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+        self.page_jobs = []
+        self.templates = load_templates(None if args.no_cache else CACHE_DIR, assets)
+
+        # With --layout fragments the chrome every page shares is rendered once into the
+        # shell script; pages reference it by a content version, so it can be cached
+        # until the chrome itself changes
+        self.layout = None
+        if args.layout == 'fragments':
+            self.layout = self.templates.get_template('layout').render(
+                head=self.templates.get_template('head_assets').render(),
+                header=self.templates.get_template('site_header').render(),
+            )
+            version = hashlib.sha256(self.layout.encode()).hexdigest()[:ASSET_HASH_LENGTH]
+            self.templates.globals['layout'] = f'{LAYOUT_PATH}?v={version}'
+
+    # Local path of the submission log, downloading it first if the source is a URL
+    def fetch_source(self):
+        from data_source import fetch_url, is_url
+        cache_dir = None if self.args.no_cache else CACHE_DIR
+        with self.stage('fetch'):
+            return fetch_url(self.source, cache_dir or tempfile.mkdtemp()) if is_url(self.source) else self.source
+
+    # Load the submission log, preferring the checked-out CSV over the GitHub raw URL.
+    # The SQLite backend loads nothing up front; each page queries its own slice.
+    def load_data(self, columns=None):
+        args = self.args
+        if args.backend == 'sqlite':
+            self.open_store()
+            return
+
+        from data_source import load_csv
+        from site_data import prepare_valid_df
+
+        cache_dir = None if args.no_cache else CACHE_DIR
+        csv_path = self.fetch_source()
+        with self.stage('parse') as record:
+            df = load_csv(csv_path, cache_dir, columns)
+            record.rows = len(df)
+        with self.stage('cleaning') as record:
+            self.valid_df = prepare_valid_df(df, self.registry)
+            record.rows = len(self.valid_df)
+        unregistered = self.registry.unregistered(df['Boom Lift ID'])
+        if unregistered:
+            listed = ', '.join(f'{lift_id} ({count})' for lift_id, count in unregistered.items())
+            print(f"Skipping submissions for lifts not in {self.args.fleet}: {listed}")
+
+    # Connect to the SQLite database and (re)import the CSV if asked to, or if the CSV
+    # changed since the last import: ingest.py appends to the CSV and the nightly build
+    # fetches a new copy, so a stale database would silently serve old data
+    def open_store(self):
+        import sqlite_store
+        from data_source import file_digest
+        self.store = sqlite_store.connect(self.args.db or sqlite_store.DEFAULT_DB_PATH)
+        csv_path = self.fetch_source()
+        if not self.args.import_csv:
+            if not os.path.exists(csv_path):
+                return
+            version = sqlite_store.data_version(self.store)
+            if file_digest(csv_path) == version:
+                return
+            if version:
+                print(f"{self.source} changed since the last import; re-importing it")
+        with self.stage('import') as record:
+            record.rows = sqlite_store.import_csv(self.store, csv_path)
+        print(f"Imported {record.rows} rows from {self.source}")
+
+    # One chunked pass over the log for --stream: every chunk is filtered to the
+    # registered lifts, filled and folded into the aggregates the pages need, then dropped
+    def load_stream(self, page_names, columns):
+        from collections import Counter
+        from data_source import iter_csv_chunks
+        from search_index import SEARCH_INDEX_COLUMNS
+        from site_data import prepare_valid_df
+        from streaming import StreamedLog
+
+        csv_path = self.fetch_source()
+        # Pages whose digest covers their columns of the whole log; pay period and lift
+        # pages keep one digest per period or lift
+        data_pages = [name for name in page_names
+                      if self.columns_for(name) and name not in ('two-week-summary', 'lifts')]
+        digest_columns = {name: page_columns(name) for name in data_pages}
+        if 'full-data' in page_names:
+            digest_columns['search-index'] = SEARCH_INDEX_COLUMNS
+        self.stream = StreamedLog(
+            digest_columns,
+            fleet='index' in data_pages,
+            cube=any(name in CUBE_PAGES for name in page_names),
+            periods=self.recent_periods if 'two-week-summary' in page_names else None,
+            lift_ids=self.registry.lift_ids if 'lifts' in page_names else None,
+            full_data_columns=display_columns if 'full-data' in page_names else None,
+            search='full-data' in page_names,
         )
-    },
-    'full-data.html': {
-        'page_title': 'Full Data',
-        'content': (
+        unregistered = Counter()
+        with self.stage('stream') as record:
+            for chunk in iter_csv_chunks(csv_path, columns, self.args.chunk_rows):
+                unregistered.update(self.registry.unregistered(chunk['Boom Lift ID']))
+                self.stream.add(prepare_valid_df(chunk, self.registry))
+            self.stream.finish()
+            record.rows = self.stream.rows
+        if unregistered:
+            listed = ', '.join(f'{lift_id} ({count})' for lift_id, count in unregistered.most_common())
+            print(f"Skipping submissions for lifts not in {self.args.fleet}: {listed}")
+        if self.stream.keep_cube:
+            self.cube = self.stream.cube
+            self.queue_cost_cube()
+
+    # The per-lift fleet state snapshot for the index page, replayed from the full
+    # log first if ingest has not kept it in step with the CSV
+    def load_fleet_snapshot(self):
+        from data_source import is_url
+        from fleet_snapshot import is_fresh, load_prepared, load_snapshot, replay, save_snapshot
+        if self.args.backend != 'csv' or is_url(self.source):
+            print("--fleet-snapshot needs a local CSV source; computing the fleet state from scratch")
+            return
+        snapshot = load_snapshot()
+        if not is_fresh(snapshot, self.source):
+            with self.stage('fleet_snapshot_replay') as record:
+                df = load_prepared(self.source, None if self.args.no_cache else CACHE_DIR)
+                snapshot = replay(df, self.source)
+                record.rows = len(df)
+            save_snapshot(snapshot)
+            print(f"Replayed the fleet snapshot from {self.source}")
+        self.fleet_snapshot = snapshot
+
+    # Submission columns a page reads from valid_df; the index reads none from a snapshot
+    def columns_for(self, name):
+        if name == 'index' and self.fleet_snapshot is not None:
+            return []
+        return page_columns(name)
+
+    # What a data page's content depends on besides the generator; the index also
+    # lists registered lifts that have no submissions
+    def page_data_digest(self, name):
+        if name == 'index' and self.fleet_snapshot is not None:
+            from fleet_snapshot import snapshot_digest
+            return snapshot_digest(self.fleet_snapshot) + self.registry.digest()
+        digest = self.stream.digests[name] if self.stream is not None else self.data_digest(page_columns(name))
+        if name == 'index':
+            return digest + self.registry.digest()
+        return digest
+
+    # A data page depends on the valid_df columns it reads, or on the imported SQLite data
+    def data_digest(self, columns):
+        if self.valid_df is not None:
+            return frame_digest(self.valid_df[columns])
+        import sqlite_store
+        return sqlite_store.data_version(self.store)
+
+    # Aggregate the cost cube once for every page that slices totals from it, and
+    # publish it for dashboards. SQLite rolls rows up per day before they are read.
+    def load_cost_cube(self):
+        from cost_cube import compute_cube, cube_from_daily_totals
+        with self.stage('cost_cube') as record:
+            if self.valid_df is None:
+                import sqlite_store
+                with self.store_lock:
+                    totals = sqlite_store.daily_totals(self.store, self.registry.known_ids)
+                self.cube = cube_from_daily_totals(totals, self.registry)
+            else:
+                self.cube = compute_cube(self.valid_df)
+            record.rows = len(self.cube)
+        self.queue_cost_cube()
+
+    def queue_cost_cube(self):
+        from cost_cube import CUBE_PATH, cube_json
+        self.queue_page(CUBE_PATH, self.page_digest(CUBE_PATH, frame_digest(self.cube)), partial(cube_json, self.cube))
+
+    # Row access for each page, from the in-memory frame or from SQLite
+    def load_all_rows(self):
+        if self.valid_df is not None:
+            return self.valid_df
+        import sqlite_store
+        from site_data import prepare_valid_df
+        with self.store_lock:
+            if self.all_rows is None:
+                with self.stage('query:all_rows') as record:
+                    rows = sqlite_store.read_rows(self.store, self.registry.known_ids)
+                    record.rows = len(rows)
+                self.all_rows = prepare_valid_df(rows, self.registry)
+        return self.all_rows
+
+    def load_fleet_rows(self):
+        if self.valid_df is None:
+            import sqlite_store
+            from site_data import prepare_valid_df
+            with self.store_lock, self.stage('query:fleet_rows') as record:
+                rows = sqlite_store.fleet_rows(self.store, self.registry.known_ids)
+                record.rows = len(rows)
+            return prepare_valid_df(rows, self.registry)
+        return self.valid_df
+
+    def load_period_rows(self, numbers):
+        from pay_periods import PERIOD_DAYS, add_period_columns, period_start
+        if self.valid_df is None:
+            import sqlite_store
+            from site_data import prepare_valid_df
+            start = period_start(min(numbers))
+            end = period_start(max(numbers)) + timedelta(days=PERIOD_DAYS)
+            with self.store_lock, self.stage('query:period_rows') as record:
+                rows = sqlite_store.read_rows(self.store, self.registry.known_ids, start, end)
+                record.rows = len(rows)
+            return add_period_columns(prepare_valid_df(rows, self.registry))
+        return add_period_columns(self.valid_df)
+
+    # Combined hash for a page: generator hash plus the page's own inputs
+    def page_digest(self, *parts):
+        digest = hashlib.sha256(self.generator_hash.encode())
+        for part in parts:
+            digest.update(b'\0' + str(part).encode())
+        return digest.hexdigest()
+
+    # Whether filename was already built from these inputs
+    def is_current(self, filename, digest):
+        return not self.args.force and self.manifest.get(filename) == digest and os.path.exists(filename)
+
+    # Render and write a page only if its inputs changed since the last build.
+    # render() returns the page as a string or as an iterable of string chunks.
+    # With --optimize, HTML is minified and .gz/.br siblings are written.
+    def write_page(self, filename, digest, render):
+        from assets import compress_file, minify_html, remove_compressed
+        if self.is_current(filename, digest):
+            self.skipped_pages.append(filename)
+            return
+        print(f"Generating file: {filename}")
+        with self.stage(f'render:{filename}'):
+            html_content = render()
+        if isinstance(html_content, str):
+            html_content = [html_content]
+        minify = self.args.optimize and filename.endswith('.html')
+        # Streamed pages are rendered while they are written
+        with self.stage(f'write:{filename}'), open(filename, 'w') as f:
+            for chunk in html_content:
+                f.write(minify_html(chunk) if minify else chunk)
+        if self.args.optimize:
+            with self.stage(f'compress:{filename}'):
+                compress_file(filename)
+        else:
+            remove_compressed(filename)
+        self.manifest[filename] = digest
+        print(f"Successfully wrote: {filename}")
+
+    def queue_page(self, filename, digest, render):
+        if self.profiler.cprofile:
+            self.write_page(filename, digest, render)
+        else:
+            self.page_jobs.append(self.page_pool.submit(self.write_page, filename, digest, render))
+
+    # Newest first; stable, so rows with equal times keep their order in the log
+    def get_full_data_df(self):
+        return self.load_all_rows()[display_columns].sort_values('Completion time', ascending=False, kind='stable')
+
+    # Streams the table in chunks so the full page is never held as one string;
+    # with --stream, the rows are merged from the sorted runs on disk
+    def iter_full_data_table(self):
+        from html_table import iter_html_table
+        if self.stream is not None:
+            return self.stream.runs.iter_table("full-data-table")
+        return iter_html_table(self.get_full_data_df(), display_columns, "full-data-table")
+
+    # Inverted index over the issue and maintenance text, for the full data page's search box
+    def queue_search_index(self):
+        from search_index import SEARCH_INDEX_COLUMNS, SEARCH_INDEX_PATH, search_index_json, search_rows
+        if self.stream is not None:
+            rows = self.stream.search_rows.load()
+            digest = self.stream.digests['search-index']
+        else:
+            rows = search_rows(self.load_all_rows())
+            digest = self.data_digest(SEARCH_INDEX_COLUMNS)
+        self.queue_page(SEARCH_INDEX_PATH, self.page_digest(SEARCH_INDEX_PATH, digest),
+                        partial(search_index_json, rows))
+
+    # Write the full data as monthly JSON shards plus an index; the page itself only
+    # carries the table header and the index location for script.js
+    def write_full_data_shards(self):
+        from full_data_shards import SHARD_DIR, SHARD_INDEX, index_json, month_shards, prune_shards, shard_json
+        os.makedirs(SHARD_DIR, exist_ok=True)
+        shards = []
+        for month, file, rows in month_shards(self.get_full_data_df()):
+            self.queue_page(
+                os.path.join(SHARD_DIR, file),
+                self.page_digest(file, frame_digest(rows)),
+                partial(shard_json, rows, display_columns)
+            )
+            shards.append((file, len(rows)))
+        index = index_json(display_columns, shards)
+        self.queue_page(os.path.join(SHARD_DIR, SHARD_INDEX), self.page_digest(index), lambda: index)
+        prune_shards(SHARD_DIR, {file for file, _ in shards})
+
+    def search_box(self):
+        from html_table import TABLE_TAIL, table_head
+        from search_index import SEARCH_COLUMNS, SEARCH_INDEX_PATH
+        table = table_head(['Completion time', 'Boom Lift ID'] + SEARCH_COLUMNS, 'issue-search-table') + TABLE_TAIL
+        return search_box_content.format(index=SEARCH_INDEX_PATH, table=table)
+
+    def sharded_full_data_content(self):
+        from full_data_shards import SHARD_DIR, SHARD_INDEX
+        from html_table import TABLE_TAIL, table_head
+        index_url = f'{SHARD_DIR}/{SHARD_INDEX}'
+        return (
             '<h2>Full Data</h2>'
-            '<div class="table-container">' + full_data_table + '</div>'
+            + self.search_box() +
+            '<div class="table-container">'
+            + table_head(display_columns, "full-data-table", {'data-shards': index_url}) + TABLE_TAIL +
+            '</div>'
+        )
+
+    # Each Boom Lift ID links to the lift's history page
+    def generate_latest_boom_table(self):
+        from fleet_state import compute_fleet_state, format_boom_summary
+        from html_table import generate_html_table
+        from lift_history import lift_filename
+        lift_ids = self.registry.lift_ids
+        # The streamed fleet state is kept as snapshot entries
+        snapshot = self.fleet_snapshot
+        if snapshot is None and self.stream is not None:
+            snapshot = {'lifts': self.stream.fleet}
+        if snapshot is not None:
+            from fleet_snapshot import snapshot_state
+            with self.stage('boom_summary', rows=len(snapshot['lifts'])):
+                boom_lift_summary = format_boom_summary(snapshot_state(snapshot, lift_ids, self.registry))
+        else:
+            fleet_rows = self.load_fleet_rows()
+            with self.stage('boom_summary', rows=len(fleet_rows)):
+                boom_lift_summary = format_boom_summary(compute_fleet_state(fleet_rows, lift_ids))
+        return generate_html_table(boom_lift_summary[boom_columns], boom_columns, "latest-boom-table",
+                                   links={'Boom Lift ID': lift_filename})
+
+    def generate_user_summary_table(self):
+        from html_table import generate_html_table
+        from site_data import build_user_summary
+        with self.stage('user_summary') as record:
+            user_summary = build_user_summary(self.cube)
+            record.rows = len(user_summary)
+        return generate_html_table(user_summary, user_columns, "user-summary-table")
+
+    # Current and previous periods, most recent first; --archive lists every period
+    def plan_pay_periods(self):
+        from pay_periods import period_number, period_start
+        self.now = datetime.now()
+        current_period = period_number(self.now)
+        count = current_period + 1 if self.args.archive else self.args.periods
+        self.recent_periods = [n for n in range(current_period, current_period - count, -1) if n >= 0]
+        self.recent_start_dates = [period_start(n) for n in self.recent_periods]
+        self.pay_periods = pay_period_options(self.recent_start_dates)
+
+    # 2-Week Summary with Dropdown for Pay Periods
+    def queue_pay_period_pages(self):
+        from pay_periods import calendar_entries, period_closed, period_digests, summarize_periods
+        now = self.now
+
+        # The dropdown is filled from this index, so a new period never changes older pages
+        index = json.dumps([
+            dict(period, frozen=period_closed(number, now))
+            for number, period in zip(self.recent_periods, self.pay_periods)
+        ], separators=(',', ':'))
+        self.queue_page(PERIOD_INDEX, self.page_digest(index), lambda: index)
+
+        if self.stream is not None:
+            period_rows = None
+            digests = self.stream.period_digests
+        else:
+            period_rows = self.load_period_rows(self.recent_periods)
+            with self.stage('period_digests', rows=len(period_rows)):
+                digests = period_digests(period_rows, self.recent_periods)
+
+        # (filename, period, start date, page digest) for every summary page;
+        # two-week-summary.html repeats the current period
+        pages = [
+            (period['filename'], number, start_date, self.page_digest(start_date, digests[number]))
+            for number, start_date, period in zip(self.recent_periods, self.recent_start_dates, self.pay_periods)
+        ]
+        pages.append(('two-week-summary.html',) + pages[0][1:])
+
+        # Closed periods whose rows are unchanged are frozen: their pages are kept and
+        # they are not summarised again. Only the open period and closed periods touched
+        # by backdated rows are recomputed.
+        stale = []
+        for filename, number, start_date, digest in pages:
+            if self.is_current(filename, digest):
+                self.skipped_pages.append(filename)
+                continue
+            if period_closed(number, now) and filename in self.manifest and not self.args.force:
+                print(f"Late submissions in closed period {start_date.strftime('%Y-%m-%d')}, regenerating")
+            stale.append((filename, number, start_date, digest))
+
+        # Calendar and builder data for the stale periods only, shared by their pages
+        numbers = sorted({number for _, number, _, _ in stale})
+        with self.stage('period_bucketing') as record:
+            if period_rows is None:
+                entries = self.stream.calendar
+            else:
+                entries = calendar_entries(period_rows, numbers)
+                record.rows = len(period_rows)
+            period_summaries = summarize_periods(entries, numbers, self.cube)
+
+        for filename, number, start_date, digest in stale:
+            if filename == 'two-week-summary.html':
+                render = partial(self.render_current_period_page, period_summaries[number])
+            else:
+                render = partial(self.render_pay_period_page, start_date, period_summaries[number])
+            self.queue_page(filename, digest, render)
+
+    # One history page per registered lift, summarised from a single grouped pass and
+    # rendered on the page pool. Pages of lifts whose rows are unchanged are kept;
+    # pages of lifts no longer in the registry are removed.
+    def queue_lift_pages(self):
+        from assets import remove_compressed
+        from lift_history import LIFT_FILE_RE, lift_digests, lift_filename, lift_tables, summarize_lifts
+        lift_ids = self.registry.lift_ids
+        if self.stream is not None:
+            rows = None
+            digests = self.stream.lift_digests
+        else:
+            rows = self.load_all_rows()
+            with self.stage('lift_digests', rows=len(rows)):
+                digests = lift_digests(rows, lift_ids)
+
+        stale = []
+        for lift_id in lift_ids:
+            filename = lift_filename(lift_id)
+            digest = self.page_digest(filename, digests[lift_id])
+            if self.is_current(filename, digest):
+                self.skipped_pages.append(filename)
+            else:
+                stale.append((lift_id, filename, digest))
+
+        with self.stage('lift_summaries') as record:
+            if rows is None:
+                timeline, events = self.stream.timeline, self.stream.events.load()
+            else:
+                timeline, events = lift_tables(rows)
+                record.rows = len(rows)
+            summaries = summarize_lifts(timeline, events, [lift_id for lift_id, _, _ in stale], self.cube)
+        for lift_id, filename, digest in stale:
+            self.queue_page(filename, digest, partial(self.render_lift_page, lift_id, summaries[lift_id]))
+
+        current = {lift_filename(lift_id) for lift_id in lift_ids}
+        for filename in os.listdir('.'):
+            if LIFT_FILE_RE.fullmatch(filename) and filename not in current:
+                print(f"Removing history page of unregistered lift: {filename}")
+                os.remove(filename)
+                remove_compressed(filename)
+                self.manifest.pop(filename, None)
+
+    # Pages carry the full chrome, or with --layout fragments only their own content
+    def page_template(self, name):
+        return self.templates.get_template('fragment' if self.layout is not None else name)
+
+    def render_lift_page(self, lift_id, summary):
+        from lift_history import generate_lift_history
+        with self.stage(f'lift:{lift_id}', rows=summary['rows']):
+            content = generate_lift_history(lift_id, summary)
+        return self.page_template('no_dropdown').render(
+            page_title=f'Boom Lift {lift_id}',
+            content=content
         )
-    },
-    'user-summary.html': {
-        'page_title': 'User Summary',
-        'content': (
-            '<h2>User Summary</h2>'
-            '<div class="table-container">' + user_summary_table + '</div>'
+
+    # Generate pages for each pay period
+    def render_pay_period_page(self, start_date, summary):
+        from pay_periods import generate_pay_period_summary
+        with self.stage(f"pay_period:{start_date.strftime('%Y-%m-%d')}", rows=summary['submissions']):
+            daily_review_html, builder_summary_table = generate_pay_period_summary(start_date, summary)
+        end_date = start_date + timedelta(days=13)
+        content = f"""
+        <h2>2-Week Summary ({start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')})</h2>
+        <h3>Daily Review</h3>
+        {daily_review_html}
+        <h3>Builder Summary</h3>
+        <div class="table-container">{builder_summary_table}</div>
+    """
+        return self.page_template('with_dropdown').render(
+            page_title=f'2-Week Summary ({start_date.strftime("%Y-%m-%d")})',
+            content=content,
+            period=self.pay_periods[self.recent_start_dates.index(start_date)],
+            period_index=PERIOD_INDEX
         )
-    }
-}
-
-# Generate remaining HTML pages without dropdown
-template = Template(base_template_no_dropdown)
-for filename, data in pages.items():
-    print(f"Generating file: {filename}")
-    html_content = template.render(
-        page_title=data['page_title'],
-        content=data['content']
-    )
-    with open(filename, 'w') as f:
-        f.write(html_content)
-    print(f"Successfully wrote: {filename}")
+
+    def render_current_period_page(self, summary):
+        from pay_periods import generate_pay_period_summary
+        latest_start_date = self.recent_start_dates[0].strftime('%Y-%m-%d')  # Current period
+        with self.stage('pay_period:current', rows=summary['submissions']):
+            daily_review_html, builder_summary_table = generate_pay_period_summary(self.recent_start_dates[0], summary)
+        end_date = self.recent_start_dates[0] + timedelta(days=13)
+        current_content = f"""
+    <h2>2-Week Summary ({latest_start_date} to {end_date.strftime('%Y-%m-%d')})</h2>
+    <h3>Daily Review</h3>
+    {daily_review_html}
+    <h3>Builder Summary</h3>
+    <div class="table-container">{builder_summary_table}</div>
+"""
+        return self.page_template('with_dropdown').render(
+            page_title='2-Week Summary (Current)',
+            content=current_content,
+            period=self.pay_periods[0],
+            period_index=PERIOD_INDEX
+        )
+
+    # Generate other pages without dropdown
+    def site_pages(self):
+        return {
+            'submit.html': {
+                'page_title': 'Submit Boom Lift Data',
+                'content': submit_page_content(self.registry.lift_ids),
+                'static': True,
+                'inputs': [self.registry.digest()]
+            },
+            'index.html': {
+                'page_title': 'Home',
+                'content': lambda: (
+                    '<div class="summary">'
+                    '<h2>Welcome</h2>'
+                    '<p>This website tracks boom lift information submitted daily by M&D General Contracting\'s installers, '
+                    'providing real-time insights into equipment usage and maintenance needs.</p>'
+                    '</div>'
+                    '<h2>Latest Boom Lift Summary</h2>'
+                    '<div class="table-container">' + self.generate_latest_boom_table() + '</div>'
+                )
+            },
+            'full-data.html': {
+                'page_title': 'Full Data',
+                'content': lambda: (
+                    '<h2>Full Data</h2>' + self.search_box() + '<div class="table-container">',
+                    self.iter_full_data_table(),
+                    '</div>'
+                )
+            },
+            'user-summary.html': {
+                'page_title': 'User Summary',
+                'content': lambda: (
+                    '<h2>User Summary</h2>'
+                    '<div class="table-container">' + self.generate_user_summary_table() + '</div>'
+                )
+            }
+        }
+
+    def render_page(self, data):
+        content = data['content'] if data.get('static') else data['content']()
+        if isinstance(content, str):
+            return self.page_template('no_dropdown').render(
+                page_title=data['page_title'],
+                content=content
+            )
+        before, chunks, after = content
+        return self.stream_page(data['page_title'], before, chunks, after)
+
+    def stream_page(self, page_title, before, chunks, after):
+        head, tail = self.page_template('no_dropdown').render(
+            page_title=page_title,
+            content=before + STREAM_MARKER + after
+        ).split(STREAM_MARKER)
+        yield head
+        yield from chunks
+        yield tail
+
+    # Queue the selected pages, wait for them and persist the manifest
+    def run(self, page_names=PAGE_NAMES):
+        if self.args.fleet_snapshot and 'index' in page_names:
+            self.load_fleet_snapshot()
+        if 'two-week-summary' in page_names:
+            self.plan_pay_periods()
+
+        # Only the submission form, and the index from a snapshot, need no submission data
+        columns = [col for name in page_names for col in self.columns_for(name)]
+        cube_pages = [name for name in page_names if name in CUBE_PAGES]
+        if cube_pages:
+            from cost_cube import CUBE_COLUMNS
+            columns += CUBE_COLUMNS
+        if columns and self.args.stream:
+            self.load_stream(page_names, list(dict.fromkeys(columns)))
+        elif columns:
+            self.load_data(list(dict.fromkeys(columns)))
+            if cube_pages:
+                self.load_cost_cube()
+
+        if 'two-week-summary' in page_names:
+            self.queue_pay_period_pages()
+        if 'lifts' in page_names:
+            self.queue_lift_pages()
+        if 'full-data' in page_names:
+            self.queue_search_index()
+        if self.layout is not None:
+            self.queue_page(LAYOUT_PATH, self.page_digest(LAYOUT_PATH), lambda: self.layout)
+
+        pages = self.site_pages()
+        if 'full-data' in page_names and self.args.full_data_mode == 'shards':
+            self.write_full_data_shards()
+            pages['full-data.html'] = {
+                'page_title': 'Full Data',
+                'content': self.sharded_full_data_content(),
+                'static': True
+            }
+
+        # Static pages depend on the generator and any listed inputs; data pages on the columns they read
+        pages = {filename: data for filename, data in pages.items() if filename[:-len('.html')] in page_names}
+        for filename, data in pages.items():
+            if data.get('static'):
+                digest = self.page_digest(filename, *data.get('inputs', []))
+            else:
+                digest = self.page_digest(filename, self.page_data_digest(filename[:-len('.html')]))
+            self.queue_page(filename, digest, partial(self.render_page, data))
+
+        # Wait for every page; result() re-raises any rendering or write error
+        try:
+            self.page_pool.shutdown(wait=True)
+            for job in self.page_jobs:
+                job.result()
+        finally:
+            if self.stream is not None:
+                self.stream.close()
+
+        # Persist the manifest and report what was skipped
+        with open(MANIFEST_PATH, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        print(f"Skipped {len(self.skipped_pages)} unchanged page(s)")
+
+        if self.profiler.enabled:
+            self.profiler.print_summary()
+            report_path = self.args.profile or 'build-profile.json'
+            self.profiler.write_report(report_path)
+            print(f"Wrote profile report: {report_path}")
+            if self.args.profile_dump:
+                slowest = self.profiler.dump_slowest(self.args.profile_dump)
+                print(f"Wrote cProfile stats for slowest stage '{slowest}': {self.args.profile_dump}")
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {value}')
+    return value
+
+
+def add_build_arguments(parser):
+    parser.add_argument('--page', action='append', choices=PAGE_NAMES, default=None,
+                        help='Build only this page; repeat for several (default: every page)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every page, ignoring the build manifest')
+    parser.add_argument('--source', default=None,
+                        help=f'CSV path or URL (default: {DEFAULT_CSV_PATH} if present, else {CSV_URL})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the download or parsed-frame cache')
+    parser.add_argument('--fleet', default=DEFAULT_REGISTRY_PATH,
+                        help=f'Fleet registry: the lifts to report on and their ID aliases (default: {DEFAULT_REGISTRY_PATH})')
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default='csv',
+                        help='Load the whole CSV, or query only the rows each page needs from SQLite')
+    parser.add_argument('--db', default=None, help='SQLite database path (default: data/boom_lift_data.sqlite)')
+    parser.add_argument('--import-csv', action='store_true',
+                        help='With --backend sqlite, (re)import the CSV source into the database first; '
+                             'without it the CSV is re-imported only if it changed since the last import')
+    parser.add_argument('--full-data-mode', choices=['html', 'shards'], default='html',
+                        help='Inline every row in full-data.html, or write monthly JSON shards it loads on demand')
+    parser.add_argument('--layout', choices=['full', 'fragments'], default='full',
+                        help='Repeat the head, header and navigation in every page, or write them once to '
+                             f'{LAYOUT_PATH} and emit each page as its title and content only')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read the CSV in chunks and keep only per-lift and per-period aggregates in memory; '
+                             'full-data.html is merged from sorted runs on disk. Maintenance events and rows with '
+                             'issue text are spilled to disk and loaded while the lift pages and search index are '
+                             'built, so those pages still hold every such row. Needs --backend csv and '
+                             '--full-data-mode html')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help=f'Rows per chunk with --stream (default: {CHUNK_ROWS})')
+    parser.add_argument('--workers', type=int, default=min(8, os.cpu_count() or 1),
+                        help='Number of threads rendering and writing pages (default: min(8, CPUs))')
+    parser.add_argument('--periods', type=positive_int, default=11,
+                        help='Number of pay periods (current and previous) to generate (default: 11)')
+    parser.add_argument('--archive', action='store_true',
+                        help='List every pay period since the first; closed, unchanged periods are frozen '
+                             'and never recomputed')
+    parser.add_argument('--fleet-snapshot', action='store_true',
+                        help='Build the index page from data/fleet-state.json instead of the full log, '
+                             'replaying the snapshot first if it is missing or stale')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Minify HTML, write .gz/.br siblings of every page and data file, and '
+                             'reference content-hashed copies of style.css and script.js')
+    parser.add_argument('--profile', nargs='?', const='build-profile.json', default=None, metavar='PATH',
+                        help='Record per-stage wall/CPU time, peak RSS and row counts to a JSON report '
+                             '(default path: build-profile.json)')
+    parser.add_argument('--profile-dump', default=None, metavar='PATH',
+                        help='Also run each stage under cProfile and save the slowest stage\'s stats; '
+                             'pages are then written one at a time')
+
+
+def build(args):
+    SiteBuild(args).run(args.page or PAGE_NAMES)
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # `ingest` hands its arguments straight to ingest.py, which needs no pandas
+    if argv[:1] == ['ingest']:
+        import ingest
+        return ingest.main(argv[1:])
+    if argv[:1] == ['snapshot']:
+        import fleet_snapshot
+        return fleet_snapshot.main(argv[1:])
+    # Bare `generate_html.py [options]` still means a full build
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv = ['build'] + argv
+
+    parser = argparse.ArgumentParser(description='Generate the M&D maintenance website pages.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    add_build_arguments(commands.add_parser('build', help='Build every page, or only those given with --page'))
+    commands.add_parser('ingest', help='Append or spool form submissions (see `ingest --help`)')
+    commands.add_parser('snapshot', help='Replay or check the fleet state snapshot (see `snapshot --help`)')
+    watch_command = commands.add_parser('watch', help='Build, then rebuild the affected pages whenever the CSV, '
+                                                      'style.css, script.js or the generator changes')
+    add_build_arguments(watch_command)
+    serve_command = commands.add_parser('serve', help='Watch, and serve the site on a local HTTP server that '
+                                                      'reloads open pages after each rebuild')
+    add_build_arguments(serve_command)
+    serve_command.add_argument('--port', type=int, default=8000, help='HTTP port (default: 8000)')
+    serve_command.add_argument('--bind', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    args = parser.parse_args(argv)
+    if getattr(args, 'stream', False) and (args.backend != 'csv' or args.full_data_mode != 'html'):
+        parser.error('--stream needs --backend csv and --full-data-mode html')
+    if args.command in ('watch', 'serve'):
+        import dev_server
+        return dev_server.watch(args, serve=args.command == 'serve')
+    return build(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
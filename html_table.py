@@ -0,0 +1,75 @@
+from html import escape
+import numpy as np
+
+# Rows rendered per chunk when streaming a table
+STREAM_CHUNK_ROWS = 5000
+
+# Separator for escaping a whole column in one pass; never produced by escape()
+CELL_SEP = '\x00'
+
+
+# Format and escape one column at once, returning a list of cell strings.
+# Going through object values keeps str() formatting (Timestamps, 'nan', 'True').
+# Escaping runs on the column joined into one string, then splits it back.
+def format_column(series):
+    values = format_datetimes(series)
+    if values is None:
+        values = series.to_numpy(dtype=object).astype(str).tolist()
+    text = CELL_SEP.join(values)
+    if not ('&' in text or '<' in text or '>' in text):
+        return values
+    if text.count(CELL_SEP) != len(values) - 1:
+        return [escape(value, quote=False) for value in values]
+    return escape(text, quote=False).split(CELL_SEP)
+
+
+# Fast path for whole-second, timezone-naive datetime columns, formatted like
+# str(Timestamp); returns None when the column needs the generic path
+def format_datetimes(series):
+    if series.dtype.kind != 'M':
+        return None
+    values = series.to_numpy()
+    seconds = values.astype('datetime64[s]')
+    if not (np.isnat(values) | (seconds == values)).all():
+        return None
+    return [v if v == 'NaT' else v[:10] + ' ' + v[11:] for v in np.datetime_as_string(seconds).tolist()]
+
+
+# attrs adds extra attributes to the <table> element, e.g. data-* hooks for script.js
+def table_head(columns, table_id, attrs=None):
+    headers = ''.join(f'<th>{escape(str(col), quote=False)}</th>' for col in columns)
+    extra = ''.join(f' {name}="{escape(str(value))}"' for name, value in (attrs or {}).items())
+    return f'<table class="data-table" id="{escape(table_id)}"{extra}><thead><tr>{headers}</tr></thead><tbody>'
+
+
+TABLE_TAIL = '</tbody></table>'
+
+
+# One <tr> string per row of the frame, formatted column by column.
+# links maps a column to a function giving each value's link target.
+def row_strings(df, columns, links=None):
+    cells = [format_column(df[col]) for col in columns]
+    for col, href in (links or {}).items():
+        index = columns.index(col)
+        cells[index] = [
+            f'<a href="{escape(href(value))}">{cell}</a>' for value, cell in zip(df[col], cells[index])
+        ]
+    return ['<tr><td>' + '</td><td>'.join(row) + '</td></tr>' for row in zip(*cells)]
+
+
+# Render the body rows of a frame slice in a single join
+def table_rows(df, columns, links=None):
+    return ''.join(row_strings(df, columns, links))
+
+
+# Yield a table as string chunks of at most chunk_rows rows, for writing straight to a file
+def iter_html_table(df, columns, table_id, chunk_rows=STREAM_CHUNK_ROWS):
+    yield table_head(columns, table_id)
+    for start in range(0, len(df), chunk_rows):
+        yield table_rows(df.iloc[start:start + chunk_rows], columns)
+    yield TABLE_TAIL
+
+
+# Helper function to generate HTML table with a unique ID
+def generate_html_table(df, columns, table_id, links=None):
+    return table_head(columns, table_id) + table_rows(df, columns, links) + TABLE_TAIL
@@ -0,0 +1,173 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
+
+from data_source import COST_COLUMNS, CSV_COLUMNS, DEFAULT_CSV_PATH, FLAG_COLUMNS, TRUE_VALUES, parse_local_time
+from fleet_snapshot import DEFAULT_SNAPSHOT_PATH, record_append
+
+REQUIRED_COLUMNS = ['Completion time', 'Name', 'Boom Lift ID']
+
+# Submissions waiting to be appended, one JSON file each
+SPOOL_DIR = 'data/spool'
+
+
+# Completion times are stored in site-local time, in the format the form export used
+def format_completion_time(value):
+    text = str(value).strip()
+    try:
+        when = parse_local_time(text)
+    except ValueError:
+        raise ValueError(f"Unrecognised Completion time: {text!r}")
+    return f"{when.month}/{when.day}/{when.year} {when.hour}:{when.minute:02d}"
+
+
+# Validate a form payload and map it onto the CSV schema; raises ValueError
+def normalize_submission(payload):
+    if not isinstance(payload, dict):
+        raise ValueError('Submission payload must be a JSON object')
+    values = {k: ('' if v is None else str(v).strip()) for k, v in payload.items()}
+    if values.get('Builder') == 'Other' and values.get('Other Builder'):
+        values['Builder'] = values['Other Builder']
+
+    missing = [col for col in REQUIRED_COLUMNS if not values.get(col)]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+
+    row = {col: values.get(col, '') for col in CSV_COLUMNS}
+    row['Completion time'] = format_completion_time(row['Completion time'])
+    if row['Hours']:
+        try:
+            hours = float(row['Hours'])
+        except ValueError:
+            raise ValueError(f"Hours must be a number: {row['Hours']!r}")
+        if hours < 0:
+            raise ValueError('Hours must not be negative')
+        row['Hours'] = str(int(hours))
+    for col in FLAG_COLUMNS:
+        row[col] = 'True' if row[col].lower() in TRUE_VALUES else ''
+    for col in COST_COLUMNS:
+        if row[col]:
+            try:
+                row[col] = f"{float(row[col]):g}"
+            except ValueError:
+                raise ValueError(f"{col} must be a number: {row[col]!r}")
+    return row
+
+
+# Header columns and line terminator of an existing CSV, reading only its first line
+def read_header(path):
+    with open(path, 'r', newline='') as f:
+        line = f.readline()
+    newline = '\r\n' if line.endswith('\r\n') else '\n'
+    return next(csv.reader([line])), newline
+
+
+# Append rows to the CSV without reading the existing data; returns the number appended
+def append_rows(rows, path=DEFAULT_CSV_PATH):
+    if not rows:
+        return 0
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
+    columns, newline = read_header(path) if exists else (CSV_COLUMNS, '\r\n')
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        needs_newline = False
+        if exists:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+        with open(f.fileno(), 'a', newline='', encoding='utf-8', closefd=False) as text:
+            if needs_newline:
+                text.write(newline)
+            writer = csv.writer(text, lineterminator=newline)
+            if not exists:
+                writer.writerow(columns)
+            writer.writerows([row.get(col, '') for col in columns] for row in rows)
+    return len(rows)
+
+
+# Append rows and fold them into the fleet state snapshot, if it is current
+def append_submissions(rows, path=DEFAULT_CSV_PATH, snapshot_path=DEFAULT_SNAPSHOT_PATH):
+    size_before = os.path.getsize(path) if os.path.exists(path) else 0
+    count = append_rows(rows, path)
+    if count and not record_append(rows, path, size_before, snapshot_path):
+        print(f"Fleet snapshot {snapshot_path} is missing or stale; the next build will replay it")
+    return count
+
+
+# Queue a validated submission in the spool; file names sort in arrival order
+def spool_submission(payload, spool_dir=SPOOL_DIR):
+    row = normalize_submission(payload)
+    os.makedirs(spool_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    path = os.path.join(spool_dir, f"{stamp}-{uuid.uuid4().hex[:8]}.json")
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(row, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+# Coalesce every spooled submission into one append, then clear the spool
+def flush_spool(path=DEFAULT_CSV_PATH, spool_dir=SPOOL_DIR, snapshot_path=DEFAULT_SNAPSHOT_PATH):
+    if not os.path.isdir(spool_dir):
+        return 0
+    files = sorted(name for name in os.listdir(spool_dir) if name.endswith('.json'))
+    rows = []
+    for name in files:
+        with open(os.path.join(spool_dir, name)) as f:
+            rows.append(normalize_submission(json.load(f)))
+    count = append_submissions(rows, path, snapshot_path)
+    for name in files:
+        os.remove(os.path.join(spool_dir, name))
+    return count
+
+
+def load_payload(args):
+    if args.payload_env:
+        return json.loads(os.environ[args.payload_env])
+    if args.payload_file and args.payload_file != '-':
+        with open(args.payload_file) as f:
+            return json.load(f)
+    return json.load(sys.stdin)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Append form submissions to the boom lift CSV.')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help=f'CSV to append to (default: {DEFAULT_CSV_PATH})')
+    parser.add_argument('--spool-dir', default=SPOOL_DIR, help=f'Spool directory (default: {SPOOL_DIR})')
+    parser.add_argument('--fleet-snapshot', default=DEFAULT_SNAPSHOT_PATH,
+                        help=f'Fleet state snapshot to update (default: {DEFAULT_SNAPSHOT_PATH})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in [('append', 'Validate one submission and append it now'),
+                            ('spool', 'Validate one submission and queue it in the spool')]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--payload-file', help='JSON payload file (default: stdin)')
+        command.add_argument('--payload-env', help='Environment variable holding the JSON payload')
+    commands.add_parser('flush', help='Append every spooled submission in one write')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'flush':
+            print(f"Appended {flush_spool(args.csv, args.spool_dir, args.fleet_snapshot)} spooled submission(s)")
+        elif args.command == 'spool':
+            print(f"Queued submission: {spool_submission(load_payload(args), args.spool_dir)}")
+        else:
+            append_submissions([normalize_submission(load_payload(args))], args.csv, args.fleet_snapshot)
+            print(f"Appended 1 submission to {args.csv}")
+    except ValueError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import hashlib
+import re
+from html import escape
+import pandas as pd
+from cost_cube import COST_MEASURES, EVENT_MEASURES, WORK_COSTS
+from data_source import FLAG_COLUMNS, concat_frames, update_group_digests
+from html_table import TABLE_TAIL, row_strings, table_head
+
+# Columns the lift history pages read; their digests cover only these
+LIFT_COLUMNS = [
+    'Completion time', 'Name', 'Boom Lift ID', 'Site', 'Hours', 'Maintenance Work', 'Other Work',
+] + FLAG_COLUMNS + list(WORK_COSTS.values())
+
+TIMELINE_COLUMNS = ['Date', 'Hours', 'Submissions', 'Site']
+EVENT_COLUMNS = ['Completion time', 'Name', 'Hours', 'Work', 'Maintenance Work', 'Other Work', 'Cost']
+COST_TABLE_COLUMNS = ['Work', 'Events', 'Cost']
+
+# History pages are named after the lift ID. Anything unsafe in a file name is
+# replaced, and a short hash of the ID is then appended, so 'A/1' and 'A_1' get
+# different pages.
+LIFT_FILE_RE = re.compile(r'lift-[A-Za-z0-9_-]+\.html')
+UNSAFE_FILE_CHARS = re.compile(r'[^A-Za-z0-9_-]')
+
+
+def lift_filename(lift_id):
+    safe = UNSAFE_FILE_CHARS.sub('_', lift_id)
+    if safe != lift_id:
+        safe += '-' + hashlib.sha256(lift_id.encode()).hexdigest()[:8]
+    return 'lift-' + safe + '.html'
+
+
+# Content hash of each lift's rows, fed from one vectorised hashing pass per frame
+def lift_hashers(lift_ids):
+    header = ','.join(LIFT_COLUMNS).encode()
+    return {lift_id: hashlib.sha256(header) for lift_id in lift_ids}
+
+
+def update_lift_digests(hashers, df):
+    update_group_digests(hashers, df[LIFT_COLUMNS], df['Boom Lift ID'])
+
+
+def lift_digests(df, lift_ids):
+    hashers = lift_hashers(lift_ids)
+    update_lift_digests(hashers, df)
+    return {lift_id: digest.hexdigest() for lift_id, digest in hashers.items()}
+
+
+# Table rows of each lift's group, newest first: {lift id: [row html, ...]}
+def rows_by_lift(frame, columns, lift_ids):
+    html_rows = row_strings(frame, columns)
+    positions = frame.groupby('Boom Lift ID', observed=True, sort=False).indices
+    return {lift_id: [html_rows[i] for i in positions[lift_id][::-1]] for lift_id in lift_ids if lift_id in positions}
+
+
+# Hours timeline and maintenance events of every lift in a frame, from one time
+# sort and a few grouped passes. Tables of consecutive chunks of the log are
+# merged with combine_timelines and combine_events.
+def lift_tables(df):
+    ordered = df[LIFT_COLUMNS].sort_values('Completion time', kind='stable')
+    time = ordered['Completion time']
+    keys = [ordered['Boom Lift ID'], time.dt.normalize().rename('Date')]
+
+    # Highest reported hours per day, with the last site the lift was used at and
+    # when it was reported, so later chunks can override it
+    timeline = ordered.groupby(keys, observed=True, sort=False).agg(
+        Hours=('Hours', 'max'), Submissions=('Completion time', 'count'), Site=('Site', 'last')
+    )
+    timeline['Site at'] = time.where(ordered['Site'].notna()).groupby(keys, observed=True, sort=False).max()
+
+    # One row per submission that recorded any work
+    flags = ordered[FLAG_COLUMNS].fillna(False).astype(bool)
+    other_work = ordered['Other Work'] != ''
+    has_work = (ordered['Maintenance Work'] != '') | other_work | flags.any(axis=1)
+    events = ordered.loc[has_work, ['Boom Lift ID'] + EVENT_COLUMNS[:3] + ['Maintenance Work', 'Other Work']]
+    events['Work'] = [
+        ', '.join(col for col, done in zip(FLAG_COLUMNS, row) if done)
+        for row in flags[has_work].itertuples(index=False)
+    ]
+    events['Cost'] = ordered.loc[has_work, list(WORK_COSTS.values())].sum(axis=1)
+    return timeline.reset_index(), events
+
+
+# One timeline from the timelines of consecutive chunks, oldest first
+def combine_timelines(timelines):
+    timeline = concat_frames(timelines)
+    keys = ['Boom Lift ID', 'Date']
+    # Stable, so on equal times the later chunk's site wins
+    sites = timeline.sort_values('Site at', kind='stable').groupby(keys, observed=True)[['Site', 'Site at']].last()
+    combined = timeline.groupby(keys, observed=True).agg(Hours=('Hours', 'max'), Submissions=('Submissions', 'sum'))
+    return combined.join(sites).reset_index()
+
+
+def combine_events(events):
+    return concat_frames(events).sort_values('Completion time', kind='stable')
+
+
+# Table rows for every lift from lift_tables; cost totals are sliced from the cost
+# cube. Each table is formatted for all lifts at once and then split by lift, so
+# no lift's rows are filtered or formatted one by one.
+# Returns {lift id: {'rows': count, 'timeline': [row html], 'events': [...], 'costs': [...]}},
+# table rows newest first.
+def summarize_lifts(timeline, events, lift_ids, cube):
+    timeline = timeline.sort_values('Date', kind='stable').assign(
+        Date=lambda t: t['Date'].dt.strftime('%Y-%m-%d'),
+        Hours=lambda t: t['Hours'].astype('Int64'),
+        Site=lambda t: t['Site'].astype(object).fillna(''),
+    )
+    events = events.assign(Hours=events['Hours'].astype('Int64'), Cost=events['Cost'].map('{:.2f}'.format))
+
+    # Totals per kind of work: flagged events (or Other Work entries) and their costs,
+    # as one long table of (lift, work) rows ending in each lift's total
+    totals = cube.groupby('Boom Lift ID', observed=True)[EVENT_MEASURES + COST_MEASURES].sum()
+    counts = totals[EVENT_MEASURES].set_axis(list(WORK_COSTS), axis=1)
+    costs = totals[COST_MEASURES].set_axis(list(WORK_COSTS), axis=1)
+    counts['Total'], costs['Total'] = counts.sum(axis=1), costs.sum(axis=1)
+    totals = pd.DataFrame({
+        'Events': counts.stack(),
+        'Cost': costs.stack().map('{:.2f}'.format),
+    }).rename_axis(['Boom Lift ID', 'Work']).reset_index()
+    # rows_by_lift lists rows newest first; reverse so the totals read top to bottom
+    totals = totals.iloc[::-1]
+
+    timelines = rows_by_lift(timeline, TIMELINE_COLUMNS, lift_ids)
+    submissions = timeline.groupby('Boom Lift ID', observed=True)['Submissions'].sum()
+    event_rows = rows_by_lift(events, EVENT_COLUMNS, lift_ids)
+    cost_rows = rows_by_lift(totals, COST_TABLE_COLUMNS, lift_ids)
+    return {
+        lift_id: {
+            'rows': int(submissions.get(lift_id, 0)),
+            'timeline': timelines.get(lift_id, []),
+            'events': event_rows.get(lift_id, []),
+            'costs': cost_rows.get(lift_id, []),
+        }
+        for lift_id in lift_ids
+    }
+
+
+def html_table(rows, columns, table_id):
+    return table_head(columns, table_id) + ''.join(rows) + TABLE_TAIL
+
+
+# Page content for one lift's history
+def generate_lift_history(lift_id, summary):
+    heading = f'<h2>Boom Lift {escape(lift_id)}</h2>'
+    if summary['rows'] == 0:
+        return heading + '<p class="no-submissions">No submissions recorded for this lift.</p>'
+    return (
+        heading +
+        f'<p>{summary["rows"]} submission(s)</p>'
+        '<h3>Maintenance Cost Totals</h3>'
+        '<div class="table-container">'
+        + html_table(summary['costs'], COST_TABLE_COLUMNS, 'lift-costs-table') +
+        '</div>'
+        '<h3>Maintenance Events</h3>'
+        '<div class="table-container">'
+        + html_table(summary['events'], EVENT_COLUMNS, 'lift-events-table') +
+        '</div>'
+        '<h3>Hours Timeline</h3>'
+        '<div class="table-container">'
+        + html_table(summary['timeline'], TIMELINE_COLUMNS, 'lift-timeline-table') +
+        '</div>'
+    )
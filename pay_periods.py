@@ -0,0 +1,128 @@
+import hashlib
+from datetime import datetime, timedelta
+from html import escape
+import pandas as pd
+from data_source import COST_COLUMNS, update_group_digests
+from html_table import generate_html_table
+
+# Pay periods are consecutive two-week windows anchored at the first period's start date
+PERIOD_ANCHOR = datetime(2024, 12, 30)
+PERIOD_DAYS = 14
+
+BUILDER_COLUMNS = ['Builder', 'completions', 'issues', 'maintenance_cost']
+
+# Columns the pay period pages read; their digests cover only these
+PERIOD_COLUMNS = ['Completion time', 'Name', 'Boom Lift ID', 'Builder', 'General Issues'] + COST_COLUMNS
+
+
+def period_start(number):
+    return PERIOD_ANCHOR + timedelta(days=PERIOD_DAYS * number)
+
+
+def period_number(when):
+    return (when - PERIOD_ANCHOR).days // PERIOD_DAYS
+
+
+# A period is closed once the next one has started
+def period_closed(number, now):
+    return period_start(number + 1) <= now
+
+
+def period_numbers(times):
+    return ((times - PERIOD_ANCHOR) // pd.Timedelta(days=PERIOD_DAYS)).astype('Int64')
+
+
+# Tag every row with its pay period number and calendar day, once
+def add_period_columns(df):
+    time = df['Completion time']
+    df['Period'] = period_numbers(time)
+    df['Day'] = time.dt.normalize()
+    return df
+
+
+# Content hash of each period's rows, fed from one vectorised hashing pass per
+# frame; a digest only changes when a row of that period is added, removed or edited
+def period_hashers(numbers):
+    header = ','.join(PERIOD_COLUMNS).encode()
+    return {number: hashlib.sha256(header) for number in numbers}
+
+
+def update_period_digests(hashers, df):
+    rows = df[df['Period'].isin(list(hashers))]
+    update_group_digests(hashers, rows[PERIOD_COLUMNS], rows['Period'])
+
+
+def period_digests(df, numbers):
+    hashers = period_hashers(numbers)
+    update_period_digests(hashers, df)
+    return {number: digest.hexdigest() for number, digest in hashers.items()}
+
+
+# Lift IDs per (period, day, name) for the given periods from one grouped pass,
+# in row order; entries collects them across consecutive chunks of the log
+def calendar_entries(df, numbers, entries=None):
+    entries = {} if entries is None else entries
+    subset = df[df['Period'].isin(numbers)]
+    if subset.empty:
+        return entries
+    # Lift IDs as plain objects: aggregating a categorical into lists is not supported
+    lift_ids = subset['Boom Lift ID'].astype(object)
+    lifts = lift_ids.groupby([subset['Period'], subset['Day'], subset['Name']], observed=True).agg(list)
+    for key, ids in lifts.items():
+        entries.setdefault(key, []).extend(ids)
+    return entries
+
+
+# Calendars from calendar_entries and builder totals sliced from the cost cube
+# (cost_cube.compute_cube) for the given periods.
+# Returns {period: {'days': {day: [(name, [lift ids])]}, 'builders': frame, 'submissions': count}}.
+def summarize_periods(entries, numbers, cube):
+    summaries = {}
+    for number in numbers:
+        summaries[number] = {
+            'days': {},
+            'builders': pd.DataFrame(columns=BUILDER_COLUMNS),
+            'submissions': 0,
+        }
+    for (number, day, name), ids in sorted(entries.items()):
+        if number in summaries:
+            summaries[number]['days'].setdefault(day, []).append((name, ids))
+            summaries[number]['submissions'] += len(ids)
+
+    builders = cube[cube['Period'].isin(numbers)].groupby(['Period', 'Builder'], observed=True).agg(
+        completions=('submissions', 'sum'),
+        issues=('issues', 'sum'),
+        **{col: (col, 'sum') for col in COST_COLUMNS}
+    )
+    builders['maintenance_cost'] = builders[COST_COLUMNS].sum(axis=1).map('{:.2f}'.format)
+    for number, rows in builders.reset_index().groupby('Period'):
+        summaries[number]['builders'] = rows[BUILDER_COLUMNS].reset_index(drop=True)
+    return summaries
+
+
+# Daily review calendar and builder table HTML for one period's summary
+def generate_pay_period_summary(start_date, summary):
+    # Daily Review Calendar
+    daily_review_html = '<div class="calendar"><div class="calendar-grid">'
+    days = [start_date + timedelta(days=i) for i in range(14)]
+    for day in days:
+        day_entries = summary['days'].get(pd.Timestamp(day))
+        submissions = ''
+        if day_entries:
+            for name, boom_lifts in day_entries:
+                lift_ids = ', '.join(escape(str(lift_id), quote=False) for lift_id in boom_lifts)
+                submissions += f'<p><strong>{escape(str(name), quote=False)}</strong>: {lift_ids}</p>'
+        else:
+            submissions = '<p class="no-submissions">No submissions</p>'
+        daily_review_html += (
+            f'<div class="calendar-day">'
+            f'<h4>{day.strftime("%a, %b %d")}</h4>'
+            f'{submissions}'
+            f'</div>'
+        )
+    daily_review_html += '</div></div>'
+
+    # Builder Summary
+    builder_summary_table = generate_html_table(summary['builders'], BUILDER_COLUMNS, "builder-summary-table")
+
+    return daily_review_html, builder_summary_table
@@ -0,0 +1,111 @@
+import cProfile
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageRecord:
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'wall_s': round(self.wall, 6),
+            'cpu_s': round(self.cpu, 6),
+            'peak_rss_mb': self.peak_rss_mb,
+            'rows': self.rows,
+            'thread': self.thread,
+        }
+
+
+# Records wall time, thread CPU time, process peak RSS and an optional row count
+# per named stage. When disabled, stage() costs one context-manager entry.
+# With cprofile=True each stage also runs under cProfile so the slowest one can
+# be dumped; stages must then run one at a time (no page-writer threads).
+class Profiler:
+    def __init__(self, enabled=False, cprofile=False):
+        self.enabled = enabled or cprofile
+        self.cprofile = cprofile
+        self.records = []
+        self.profiles = {}
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = StageRecord(name)
+        record.rows = rows
+        if not self.enabled:
+            yield record
+            return
+        # Only the outermost stage on a thread is profiled; profilers cannot nest
+        depth = getattr(self.local, 'depth', 0)
+        profile = cProfile.Profile() if self.cprofile and depth == 0 else None
+        self.local.depth = depth + 1
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            self.local.depth = depth
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.thread_time() - cpu
+            record.peak_rss_mb = peak_rss_mb()
+            record.thread = threading.current_thread().name
+            with self.lock:
+                self.records.append(record)
+                if profile:
+                    self.profiles[name] = profile
+
+    def slowest(self):
+        return max(self.records, key=lambda record: record.wall) if self.records else None
+
+    def report(self):
+        slowest = self.slowest()
+        return {
+            'total_wall_s': round(time.perf_counter() - self.started, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'slowest_stage': slowest.name if slowest else None,
+            'stages': [record.as_dict() for record in self.records],
+        }
+
+    def write_report(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    # Save the slowest profiled stage's cProfile stats (view with python -m pstats PATH)
+    def dump_slowest(self, path):
+        profiled = [record for record in self.records if record.name in self.profiles]
+        if not profiled:
+            return None
+        slowest = max(profiled, key=lambda record: record.wall)
+        self.profiles[slowest.name].dump_stats(path)
+        return slowest.name
+
+    def print_summary(self, limit=10):
+        print(f"{'stage':<48} {'wall s':>9} {'cpu s':>9} {'rss MB':>8} {'rows':>9}")
+        for record in sorted(self.records, key=lambda r: r.wall, reverse=True)[:limit]:
+            rows = '' if record.rows is None else record.rows
+            rss = '' if record.peak_rss_mb is None else record.peak_rss_mb
+            print(f"{record.name[:48]:<48} {record.wall:>9.4f} {record.cpu:>9.4f} {rss:>8} {rows:>9}")
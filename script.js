@@ -17,10 +17,234 @@ $(document).ready(function() {
     };
 
     const boomTable = $('#latest-boom-table').DataTable(tableOptions);
-    $('#full-data-table').DataTable(tableOptions);
+    const fullDataTable = $('#full-data-table');
+    if (fullDataTable.data('shards')) {
+        fullDataTable.DataTable($.extend({}, tableOptions, shardedTableOptions(fullDataTable.data('shards'))));
+    } else {
+        fullDataTable.DataTable(tableOptions);
+    }
     $('#user-summary-table').DataTable(tableOptions);
     $('#builder-summary-table').DataTable(tableOptions);
 
+    // Lift history pages: newest events and days first, cost totals as a plain table
+    $('#lift-events-table, #lift-timeline-table').DataTable($.extend({}, tableOptions, { "order": [[0, "desc"]] }));
+    $('#lift-costs-table').DataTable($.extend({}, tableOptions, {
+        "paging": false, "searching": false, "ordering": false, "info": false
+    }));
+
+    // Server-side style DataTables source backed by the generator's JSON shards.
+    // Shards are newest first; only the shards covering the visible page are
+    // fetched unless a search or a non-time ordering needs every row.
+    function shardedTableOptions(indexUrl) {
+        const baseUrl = indexUrl.substring(0, indexUrl.lastIndexOf('/') + 1);
+        const shardRequests = {};
+        let indexRequest = null;
+        let allRowsRequest = null;
+
+        const getJSON = (url) => fetch(url).then((response) => {
+            if (!response.ok) throw new Error(`${url}: ${response.status}`);
+            return response.json();
+        });
+        const loadIndex = () => indexRequest || (indexRequest = getJSON(indexUrl));
+        const loadShard = (file) => shardRequests[file] || (shardRequests[file] = getJSON(baseUrl + file));
+        const loadAllRows = (index) => allRowsRequest || (allRowsRequest = Promise.all(
+            index.shards.map((shard) => loadShard(shard.file))
+        ).then((shards) => [].concat(...shards)));
+
+        // Rows [from, to) in newest-first order, fetching only overlapping shards
+        function loadRange(index, from, to) {
+            const needed = [];
+            let offset = 0;
+            index.shards.forEach((shard) => {
+                if (offset < to && offset + shard.rows > from) needed.push({ shard, offset });
+                offset += shard.rows;
+            });
+            return Promise.all(needed.map((n) => loadShard(n.shard.file))).then((shards) => {
+                const rows = [];
+                shards.forEach((shardRows, i) => {
+                    const offset = needed[i].offset;
+                    shardRows.forEach((row, j) => {
+                        if (offset + j >= from && offset + j < to) rows.push(row);
+                    });
+                });
+                return rows;
+            });
+        }
+
+        function matches(row, terms) {
+            const text = row.join(' ').toLowerCase();
+            return terms.every((term) => text.includes(term));
+        }
+
+        function compareCells(a, b) {
+            const x = parseFloat(a), y = parseFloat(b);
+            if (!isNaN(x) && !isNaN(y) && String(x) === a.trim() && String(y) === b.trim()) return x - y;
+            return a < b ? -1 : a > b ? 1 : 0;
+        }
+
+        function page(request, index) {
+            const length = request.length < 0 ? index.total : request.length;
+            const search = (request.search.value || '').toLowerCase().split(/\s+/).filter(Boolean);
+            const order = request.order.length ? request.order[0] : { column: 0, dir: 'asc' };
+
+            if (!search.length && order.column === 0) {
+                // Stored order is newest first; ascending reads the range from the end
+                const from = order.dir === 'desc' ? request.start : Math.max(index.total - request.start - length, 0);
+                const to = order.dir === 'desc' ? request.start + length : index.total - request.start;
+                return loadRange(index, from, to).then((rows) => ({
+                    rows: order.dir === 'desc' ? rows : rows.reverse(),
+                    filtered: index.total
+                }));
+            }
+            return loadAllRows(index).then((allRows) => {
+                let rows = search.length ? allRows.filter((row) => matches(row, search)) : allRows.slice();
+                const sign = order.dir === 'desc' ? -1 : 1;
+                rows.sort((a, b) => sign * compareCells(a[order.column], b[order.column]));
+                return { rows: rows.slice(request.start, request.start + length), filtered: rows.length };
+            });
+        }
+
+        return {
+            serverSide: true,
+            deferRender: true,
+            ajax: function(request, callback) {
+                loadIndex()
+                    .then((index) => page(request, index).then((result) => callback({
+                        draw: request.draw,
+                        recordsTotal: index.total,
+                        recordsFiltered: result.filtered,
+                        data: result.rows
+                    })))
+                    .catch((error) => console.error('Failed to load full data shards:', error));
+            }
+        };
+    }
+
+    // Issue and maintenance search on the full data page, answered from the
+    // generator's inverted index (search-index.json) rather than the table rows.
+    // The index is fetched once, the first time the search box is used.
+    const issueSearch = $('.issue-search');
+    if (issueSearch.length) {
+        initIssueSearch(issueSearch);
+    }
+
+    function initIssueSearch(section) {
+        const input = $('#issue-search-input');
+        const liftSelect = $('#issue-search-lift');
+        const monthSelect = $('#issue-search-month');
+        const status = $('#issue-search-status');
+        const results = $('#issue-search-results');
+        let indexRequest = null;
+        let resultsTable = null;
+        let terms = [];
+
+        const escapeHtml = (text) => $('<div>').text(text).html();
+        const monthOf = (row) => row[1] === 'NaT' ? 'undated' : row[1].substring(0, 7);
+
+        const loadIndex = () => indexRequest || (indexRequest = $.getJSON(section.data('index')).then(function(index) {
+            // Sorted here: JSON objects list integer-like keys such as "12" first
+            terms = Object.keys(index.terms).sort();
+            index.lifts.forEach(function(lift) {
+                $('<option>').val(lift).text(`${lift} (${index.facets.lift[lift]})`).appendTo(liftSelect);
+            });
+            Object.keys(index.facets.month).sort().reverse().forEach(function(month) {
+                $('<option>').val(month).text(`${month} (${index.facets.month[month]})`).appendTo(monthSelect);
+            });
+            return index;
+        }, function() {
+            status.text('The search index could not be loaded.');
+        }));
+
+        // Postings are delta-encoded row IDs
+        function postings(index, term) {
+            let id = 0;
+            return index.terms[term].map((delta) => (id += delta));
+        }
+
+        // Rows containing any indexed token that starts with prefix, so results update while typing
+        function prefixMatches(index, prefix) {
+            let lo = 0, hi = terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+            }
+            const ids = new Set();
+            for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) {
+                postings(index, terms[i]).forEach((id) => ids.add(id));
+            }
+            return ids;
+        }
+
+        function search(index) {
+            // Same tokens as search_index.tokens(): letters and digits in any script, two or more
+            const tokens = (input.val().normalize('NFC').toLowerCase().match(/[\p{L}\p{N}]+/gu) || [])
+                .filter((t) => [...t].length >= 2);
+            const lift = liftSelect.val();
+            const month = monthSelect.val();
+            if (!tokens.length && !lift && !month) {
+                results.prop('hidden', true);
+                status.text('');
+                return;
+            }
+            let ids = null;
+            tokens.forEach(function(token) {
+                const matches = prefixMatches(index, token);
+                ids = ids === null ? matches : new Set([...ids].filter((id) => matches.has(id)));
+            });
+            const rowIds = ids === null ? index.rows.map((row, id) => id) : [...ids].sort((a, b) => a - b);
+            const rows = rowIds.map((id) => index.rows[id]).filter((row) =>
+                (!lift || index.lifts[row[0]] === lift) && (!month || monthOf(row) === month)
+            ).map((row) => [
+                row[1],
+                `<a href="${escapeHtml(index.lift_pages[row[0]])}">${escapeHtml(index.lifts[row[0]])}</a>`
+            ].concat(row.slice(2)));
+
+            status.text(`${rows.length} matching submission(s)`);
+            results.prop('hidden', false);
+            if (resultsTable === null) {
+                resultsTable = $('#issue-search-table').DataTable($.extend({}, tableOptions, {
+                    "searching": false, "order": [[0, "desc"]]
+                }));
+            }
+            resultsTable.clear().rows.add(rows).draw();
+            resultsTable.columns.adjust();
+        }
+
+        section.on('focusin', loadIndex);
+        input.add(liftSelect).add(monthSelect).on('input change', function() {
+            loadIndex().then(search);
+        });
+    }
+
+    // Fill the pay period dropdown from the generated period index, keeping the
+    // page's own period selected. Pages of periods the index no longer lists (older
+    // than --periods, or archived) keep their own entry, added in date order.
+    const periodSelect = $('#pay-period-select');
+    if (periodSelect.data('periods')) {
+        const currentOption = periodSelect.find('option:selected').clone();
+        const currentPeriod = currentOption.val();
+        $.getJSON(periodSelect.data('periods')).done(function(periods) {
+            periodSelect.empty();
+            let listed = false;
+            periods.forEach(function(period) {
+                if (!listed && period.filename < currentPeriod) {
+                    // Filenames embed the start date, so they sort like the periods (newest first)
+                    currentOption.appendTo(periodSelect);
+                    listed = true;
+                }
+                listed = listed || period.filename === currentPeriod;
+                $('<option>')
+                    .val(period.filename)
+                    .text(`${period.start} to ${period.end}`)
+                    .prop('selected', period.filename === currentPeriod)
+                    .appendTo(periodSelect);
+            });
+            if (!listed) {
+                currentOption.appendTo(periodSelect);
+            }
+        });
+    }
+
     let latestHours = {};
     boomTable.rows().every(function() {
         const data = this.data();
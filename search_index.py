@@ -0,0 +1,76 @@
+import re
+import unicodedata
+import numpy as np
+from full_data_shards import to_json
+from html_table import format_column
+from lift_history import lift_filename
+
+# Inverted index over the free-text issue and maintenance columns, published next
+# to full-data.html so its search box can find past incidents without loading the
+# full table. Only rows with some text are indexed; they are listed newest first
+# and a row's ID is its position in that list.
+SEARCH_INDEX_PATH = 'search-index.json'
+SEARCH_INDEX_VERSION = 2
+SEARCH_COLUMNS = ['General Issues', 'Maintenance Work', 'Other Work']
+
+# Submission columns the index reads; its digest covers only these
+SEARCH_INDEX_COLUMNS = ['Completion time', 'Boom Lift ID'] + SEARCH_COLUMNS
+
+# Tokens are lowercase runs of letters and digits in any script, after NFC
+# normalisation; script.js splits queries the same way ([\p{L}\p{N}]+). Both sides
+# use plain lowercasing, as JavaScript has no casefold.
+TOKEN_RE = re.compile(r'[^\W_]+')
+MIN_TOKEN_LENGTH = 2
+
+
+def tokens(text):
+    text = unicodedata.normalize('NFC', text).lower()
+    return {token for token in TOKEN_RE.findall(text) if len(token) >= MIN_TOKEN_LENGTH}
+
+
+# The rows of a prepared frame (site_data.prepare_valid_df) that have text to index,
+# in log order; rows of consecutive chunks can be concatenated
+def search_rows(df):
+    rows = df[SEARCH_INDEX_COLUMNS]
+    has_text = np.zeros(len(rows), dtype=bool)
+    for col in SEARCH_COLUMNS:
+        has_text |= (rows[col] != '').to_numpy(dtype=bool)
+    return rows[has_text]
+
+
+# The index JSON for search_rows output:
+#   rows: [lift, time, General Issues, Maintenance Work, Other Work], newest first,
+#         with lift an index into lifts and cells escaped like the HTML table's
+#   terms: token -> row IDs containing it, ascending and delta-encoded, tokens sorted
+#   lifts, lift_pages: lift facet values and their history pages
+#   facets: row counts per lift and per month, for the filter menus
+def search_index_json(rows):
+    rows = rows.sort_values('Completion time', ascending=False, kind='stable')
+    lift_ids = rows['Boom Lift ID'].astype(object).fillna('')
+    lifts = sorted(set(lift_ids))
+    lift_index = {lift_id: i for i, lift_id in enumerate(lifts)}
+    months = rows['Completion time'].dt.strftime('%Y-%m').fillna('undated')
+
+    postings = {}
+    texts = [rows[col].astype(str).tolist() for col in SEARCH_COLUMNS]
+    for row_id, fields in enumerate(zip(*texts)):
+        for token in tokens(' '.join(fields)):
+            postings.setdefault(token, []).append(row_id)
+    terms = {}
+    for token in sorted(postings):
+        ids = postings[token]
+        terms[token] = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+
+    cells = [format_column(rows[col]) for col in ['Completion time'] + SEARCH_COLUMNS]
+    return to_json({
+        'version': SEARCH_INDEX_VERSION,
+        'fields': SEARCH_COLUMNS,
+        'lifts': lifts,
+        'lift_pages': [lift_filename(lift_id) if lift_id else '' for lift_id in lifts],
+        'rows': [[lift_index[lift_id]] + list(row) for lift_id, row in zip(lift_ids, zip(*cells))],
+        'terms': terms,
+        'facets': {
+            'lift': lift_ids.value_counts().reindex(lifts).astype(int).to_dict(),
+            'month': months.value_counts().sort_index(ascending=False).astype(int).to_dict(),
+        },
+    })
@@ -0,0 +1,36 @@
+from data_source import COST_COLUMNS
+
+# Columns the user summary reads
+USER_SUMMARY_COLUMNS = ['Completion time', 'Name', 'Boom Lift ID', 'General Issues']
+
+# Missing values for a frame in the typed schema (data_source.apply_schema);
+# flags are already booleans there
+FILL_VALUES = {
+    'General Issues': '', 'Maintenance Work': '', 'Other Work': '', 'Hours': 0,
+    **{col: 0 for col in COST_COLUMNS},
+}
+
+
+# Keep only lifts in the fleet registry (fleet_registry.FleetRegistry), under their
+# canonical IDs, and fill missing values; without a registry every lift is kept.
+# df may hold only some columns.
+def prepare_valid_df(df, registry=None):
+    if registry is None:
+        valid_df = df.copy()
+    else:
+        valid_df = df[df['Boom Lift ID'].isin(registry.known_ids)].copy()
+        valid_df['Boom Lift ID'] = registry.canonical_ids(valid_df['Boom Lift ID'])
+    for col, value in FILL_VALUES.items():
+        if col in valid_df:
+            valid_df[col] = valid_df[col].fillna(value)
+    return valid_df
+
+
+# Submissions, latest submission and reported issues per user, sliced from the
+# cost cube (cost_cube.compute_cube)
+def build_user_summary(cube):
+    return cube.groupby('Name', observed=True).agg(
+        submissions=('submissions', 'sum'),
+        latest_submission=('latest_submission', 'max'),
+        issues=('issues', 'sum')
+    ).reset_index().sort_values('Name')
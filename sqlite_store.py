@@ -0,0 +1,150 @@
+import sqlite3
+import pandas as pd
+from data_source import COST_COLUMNS, CSV_COLUMNS, FLAG_COLUMNS, apply_schema, file_digest, iter_csv_chunks
+
+# Same 21 columns as data/boom_lift_data.csv; flags are stored as 0/1 and
+# Completion time as ISO text so it sorts and range-filters correctly
+SCHEMA_COLUMNS = [
+    (col, 'INTEGER' if col in FLAG_COLUMNS else 'REAL' if col in COST_COLUMNS + ['Hours'] else 'TEXT')
+    for col in CSV_COLUMNS
+]
+COLUMNS = CSV_COLUMNS
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+DEFAULT_DB_PATH = 'data/boom_lift_data.sqlite'
+IMPORT_CHUNK_ROWS = 100000
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+SELECT_COLUMNS = ', '.join(quote(col) for col in COLUMNS)
+ANY_MAINTENANCE = '(' + ' OR '.join(
+    [quote('Maintenance Work') + " != ''"] + [quote(col) + ' = 1' for col in FLAG_COLUMNS]
+) + ')'
+
+
+# The connection may be shared by page-writer threads; callers serialise access
+def connect(path=DEFAULT_DB_PATH):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    columns = ', '.join(f'{quote(name)} {kind}' for name, kind in SCHEMA_COLUMNS)
+    conn.executescript(f'''
+        CREATE TABLE IF NOT EXISTS submissions (id INTEGER PRIMARY KEY, {columns});
+        CREATE INDEX IF NOT EXISTS idx_submissions_lift_time
+            ON submissions ("Boom Lift ID", "Completion time");
+        CREATE INDEX IF NOT EXISTS idx_submissions_name ON submissions ("Name");
+        CREATE INDEX IF NOT EXISTS idx_submissions_time ON submissions ("Completion time");
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    ''')
+    return conn
+
+
+# Identifies the stored data for the build manifest; changes on every import
+def data_version(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    return row[0] if row else ''
+
+
+# Rows of a chunk in the typed schema (data_source.apply_schema) as table rows
+def to_records(chunk):
+    chunk = chunk.reindex(columns=COLUMNS)
+    chunk['Completion time'] = chunk['Completion time'].dt.strftime(TIME_FORMAT)
+    for col in FLAG_COLUMNS:
+        chunk[col] = chunk[col].fillna(False).astype(int)
+    return chunk
+
+
+# One-shot import: replace the table contents with the CSV, reading it in chunks
+# parsed like the CSV backend's, so both backends see the same times and flags
+def import_csv(conn, csv_path, chunksize=IMPORT_CHUNK_ROWS):
+    count = 0
+    with conn:
+        conn.execute('DELETE FROM submissions')
+        for chunk in iter_csv_chunks(csv_path, chunk_rows=chunksize):
+            to_records(chunk).to_sql('submissions', conn, if_exists='append', index=False)
+            count += len(chunk)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (file_digest(csv_path),))
+    return count
+
+
+# Convert query results to the typed frame data_source.parse_csv produces
+def from_records(df):
+    df['Completion time'] = pd.to_datetime(df['Completion time'], format=TIME_FORMAT)
+    for col in FLAG_COLUMNS:
+        df[col] = df[col].astype(bool)
+    for col, kind in SCHEMA_COLUMNS:
+        if kind == 'TEXT' and col != 'Completion time':
+            df[col] = df[col].astype(object).where(df[col].notna(), float('nan'))
+        elif kind == 'REAL':
+            df[col] = df[col].astype(float)
+    return apply_schema(df)
+
+
+def query_frame(conn, where='1', params=()):
+    sql = f'SELECT {SELECT_COLUMNS} FROM submissions WHERE {where} ORDER BY id'
+    return from_records(pd.read_sql_query(sql, conn, params=list(params)))
+
+
+def lift_filter(lift_ids):
+    return f'{quote("Boom Lift ID")} IN ({", ".join("?" * len(lift_ids))})'
+
+
+# All rows for the given lifts, optionally limited to [start, end)
+def read_rows(conn, lift_ids, start=None, end=None):
+    where, params = lift_filter(lift_ids), list(lift_ids)
+    if start is not None:
+        where += ' AND "Completion time" >= ?'
+        params.append(start.strftime(TIME_FORMAT))
+    if end is not None:
+        where += ' AND "Completion time" < ?'
+        params.append(end.strftime(TIME_FORMAT))
+    return query_frame(conn, where, params)
+
+
+# Only the rows that can determine a lift's fleet state: its latest submission,
+# the latest non-null value of each status column and its last event of each kind.
+# Each lookup is a single seek on the (Boom Lift ID, Completion time) index.
+def fleet_rows(conn, lift_ids):
+    conditions = ['1'] + [f'{quote(col)} IS NOT NULL' for col in ['Name', 'Oil Level', 'Gas Level', 'Hours']]
+    conditions += [f'{quote(col)} = 1' for col in FLAG_COLUMNS] + [ANY_MAINTENANCE]
+    ids = set()
+    for lift_id in lift_ids:
+        for condition in conditions:
+            row = conn.execute(
+                f'SELECT id FROM submissions WHERE "Boom Lift ID" = ? AND {condition} '
+                'ORDER BY "Completion time" DESC, id DESC LIMIT 1',
+                (lift_id,)
+            ).fetchone()
+            if row:
+                ids.add(row[0])
+    if not ids:
+        return query_frame(conn, '0')
+    return query_frame(conn, f'id IN ({", ".join(str(i) for i in sorted(ids))})')
+
+
+# Per-day totals for cost_cube.cube_from_daily_totals, aggregated in SQL so the
+# rows never leave the database
+def daily_totals(conn, lift_ids):
+    from cost_cube import WORK_COSTS
+    measures = [
+        'COUNT("Completion time") AS submissions',
+        'SUM(COALESCE("General Issues", \'\') != \'\') AS issues',
+        'MAX("Completion time") AS latest_submission',
+    ]
+    for work, cost in WORK_COSTS.items():
+        done = 'COALESCE("Other Work", \'\') != \'\'' if work == 'Other Work' else f'{quote(work)} = 1'
+        measures.append(f'SUM({done}) AS {quote(work + " events")}')
+        measures.append(f'SUM(COALESCE({quote(cost)}, 0)) AS {quote(cost)}')
+    df = pd.read_sql_query(
+        f'SELECT "Boom Lift ID", date("Completion time") AS "Day", "Builder", "Name", {", ".join(measures)} '
+        f'FROM submissions WHERE {lift_filter(lift_ids)} GROUP BY 1, 2, 3, 4',
+        conn, params=list(lift_ids)
+    )
+    df['Day'] = pd.to_datetime(df['Day'], format='%Y-%m-%d')
+    df['latest_submission'] = pd.to_datetime(df['latest_submission'], format=TIME_FORMAT)
+    for col in ['Boom Lift ID', 'Builder', 'Name']:
+        df[col] = df[col].astype('category')
+    for cost in WORK_COSTS.values():
+        df[cost] = df[cost].astype('float64')
+    return df
@@ -0,0 +1,210 @@
+import hashlib
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from cost_cube import combine_cubes, compute_cube
+from data_source import concat_frames
+from fleet_snapshot import merge_states, state_entries
+from html_table import STREAM_CHUNK_ROWS, TABLE_TAIL, row_strings, table_head
+from lift_history import combine_events, combine_timelines, lift_hashers, lift_tables, update_lift_digests
+from pay_periods import add_period_columns, calendar_entries, period_hashers, update_period_digests
+from search_index import search_rows
+
+# build --stream reads the submission log in chunks (data_source.iter_csv_chunks)
+# and folds each prepared chunk into what the selected pages need, so memory is
+# bounded by the chunk size and a few aggregates rather than by the log:
+#   - page digests, fed chunk by chunk
+#   - the fleet state for the index, as fleet_snapshot entries
+#   - the cost cube
+#   - the calendars of the listed pay periods
+#   - per-day lift timelines
+# full-data.html lists every row, so each chunk's rows are formatted, sorted and
+# spilled to disk as a run, and the runs are merged while the page is written.
+# The lifts' work events and the rows with issue or maintenance text are rows too;
+# they are spilled per chunk (SpilledFrames) and loaded only while the lift pages
+# or the search index are built. So memory is bounded by the chunk size, the cube
+# and timelines, and then the larger of those two row sets, not by the log.
+
+# Rows per pickled block of a run; a merge holds one block of each of its runs
+RUN_BLOCK_ROWS = 250
+
+# Runs merged at once. Every MERGE_FAN_IN runs of one size are merged into one larger
+# run, so however long the log, the page is merged from a few dozen runs at most.
+MERGE_FAN_IN = 64
+
+# Sort key of rows without a completion time, which the in-memory build lists last
+NAT_KEY = np.iinfo('int64').max
+
+
+# Formatted full-data.html rows of each chunk, sorted and kept on disk. Rows are
+# keyed on (time, newest first; position in the log), so the merged table is in
+# the order of the in-memory build's stable sort.
+class SortedRuns:
+    def __init__(self, columns):
+        self.columns = columns
+        self.dir = tempfile.mkdtemp(prefix='full-data-runs-')
+        # Run paths by level: level n runs merge n levels of chunk runs
+        self.levels = [[]]
+        self.written = 0
+        self.rows = 0
+
+    def add(self, frame):
+        if frame.empty:
+            return
+        times = frame['Completion time'].to_numpy().astype('datetime64[ns]')
+        missing = np.isnat(times)
+        keys = np.where(missing, NAT_KEY, -np.where(missing, 0, times.view('int64')))
+        order = np.argsort(keys, kind='stable')
+        rows = row_strings(frame.iloc[order], self.columns)
+        self.add_run(zip(keys[order].tolist(), (order + self.rows).tolist(), rows), 0)
+        self.rows += len(frame)
+
+    def add_run(self, entries, level):
+        path = self.write_run(entries)
+        if level == len(self.levels):
+            self.levels.append([])
+        runs = self.levels[level]
+        runs.append(path)
+        if len(runs) == MERGE_FAN_IN:
+            self.levels[level] = []
+            self.add_run(heapq.merge(*(self.read_run(run) for run in runs)), level + 1)
+            for run in runs:
+                os.remove(run)
+
+    def write_run(self, entries):
+        path = os.path.join(self.dir, f'run-{self.written}.pkl')
+        self.written += 1
+        with open(path, 'wb') as f:
+            block = []
+            for entry in entries:
+                block.append(entry)
+                if len(block) == RUN_BLOCK_ROWS:
+                    pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    block = []
+            pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def read_run(path):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    return
+                yield from block
+
+    # The merged table as string chunks of at most STREAM_CHUNK_ROWS rows, for
+    # writing straight to a file (html_table.iter_html_table)
+    def iter_table(self, table_id):
+        yield table_head(self.columns, table_id)
+        runs = [self.read_run(path) for level in self.levels for path in level]
+        rows = []
+        for _, _, row in heapq.merge(*runs):
+            rows.append(row)
+            if len(rows) == STREAM_CHUNK_ROWS:
+                yield ''.join(rows)
+                rows = []
+        yield ''.join(rows)
+        yield TABLE_TAIL
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+# Frames appended to one file on disk, loaded back together by load()
+class SpilledFrames:
+    def __init__(self, directory, name, combine):
+        self.path = os.path.join(directory, f'{name}.pkl')
+        self.combine = combine
+
+    def append(self, frame):
+        with open(self.path, 'ab') as f:
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self):
+        frames = []
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                while True:
+                    try:
+                        frames.append(pickle.load(f))
+                    except EOFError:
+                        break
+        return self.combine(frames)
+
+
+# Fold a new partial aggregate into parts, combining them once the partials outweigh
+# the running total (parts[0]): each row is then re-aggregated a few times at most,
+# not once per chunk, and at most about twice the final aggregate is held.
+def fold(parts, part, combine):
+    parts.append(part)
+    if len(parts) > 1 and sum(len(p) for p in parts[1:]) >= len(parts[0]):
+        parts[:] = [combine(parts)]
+
+
+# The aggregates of one streamed build. digest_columns maps each data page to the
+# columns its digest covers; the other arguments select the aggregates to keep.
+class StreamedLog:
+    def __init__(self, digest_columns, fleet=False, cube=False, periods=None, lift_ids=None,
+                 full_data_columns=None, search=False):
+        self.digest_columns = digest_columns
+        self.hashers = {name: hashlib.sha256(','.join(columns).encode()) for name, columns in digest_columns.items()}
+        self.fleet = {} if fleet else None
+        self.keep_cube = cube
+        self.cubes = []
+        self.periods = periods
+        self.period_hashers = None if periods is None else period_hashers(periods)
+        self.calendar = {}
+        self.lift_hashers = None if lift_ids is None else lift_hashers(lift_ids)
+        self.timelines = []
+        self.runs = None if full_data_columns is None else SortedRuns(full_data_columns)
+        self.dir = tempfile.mkdtemp(prefix='stream-spill-')
+        self.events = SpilledFrames(self.dir, 'events', combine_events)
+        self.search = search
+        self.search_rows = SpilledFrames(self.dir, 'search-rows', concat_frames)
+        self.rows = 0
+
+    # Fold one prepared chunk (site_data.prepare_valid_df) into every aggregate
+    def add(self, chunk):
+        for name, digest in self.hashers.items():
+            digest.update(pd.util.hash_pandas_object(chunk[self.digest_columns[name]], index=False).values.tobytes())
+        if self.fleet is not None:
+            merge_states(self.fleet, state_entries(chunk))
+        if self.keep_cube:
+            fold(self.cubes, compute_cube(chunk), combine_cubes)
+        if self.periods is not None:
+            add_period_columns(chunk)
+            update_period_digests(self.period_hashers, chunk)
+            calendar_entries(chunk, self.periods, self.calendar)
+        if self.lift_hashers is not None:
+            update_lift_digests(self.lift_hashers, chunk)
+            timeline, events = lift_tables(chunk)
+            fold(self.timelines, timeline, combine_timelines)
+            self.events.append(events)
+        if self.runs is not None:
+            self.runs.add(chunk[self.runs.columns])
+        if self.search:
+            self.search_rows.append(search_rows(chunk))
+        self.rows += len(chunk)
+
+    # Digests and merged tables, once every chunk has been added; the spilled
+    # events and search rows are loaded by their pages (SpilledFrames.load)
+    def finish(self):
+        self.digests = {name: digest.hexdigest() for name, digest in self.hashers.items()}
+        if self.keep_cube:
+            self.cube = combine_cubes(self.cubes)
+        if self.period_hashers is not None:
+            self.period_digests = {number: digest.hexdigest() for number, digest in self.period_hashers.items()}
+        if self.lift_hashers is not None:
+            self.lift_digests = {lift_id: digest.hexdigest() for lift_id, digest in self.lift_hashers.items()}
+            self.timeline = combine_timelines(self.timelines)
+
+    def close(self):
+        if self.runs is not None:
+            self.runs.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
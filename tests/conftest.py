@@ -0,0 +1,46 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from assets import ASSET_FILES  # noqa: E402
+from benchmarks.generate_data import registry_path, write_csv  # noqa: E402
+from data_source import DEFAULT_CSV_PATH  # noqa: E402
+from fleet_registry import DEFAULT_REGISTRY_PATH  # noqa: E402
+
+
+# A small synthetic log and its fleet registry, written once per test session
+@pytest.fixture(scope='session')
+def sample_csv(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('source') / 'boom_lift_data.csv')
+    return write_csv(path, 600, lifts=12, names=6, sites=5, seed=3, start='2025-01-01', end='2025-06-30')
+
+
+# Build the site from sample_csv in a fresh directory and return its pages and
+# data files by name; the build manifest is left out, as its digests depend on
+# the backend
+@pytest.fixture
+def build_site(tmp_path, monkeypatch, sample_csv):
+    import generate_html
+
+    def build(name, *options):
+        directory = tmp_path / name
+        os.makedirs(directory / 'data')
+        for asset in ASSET_FILES:
+            shutil.copy(os.path.join(ROOT, asset), directory / asset)
+        shutil.copy(sample_csv, directory / DEFAULT_CSV_PATH)
+        shutil.copy(registry_path(sample_csv), directory / DEFAULT_REGISTRY_PATH)
+        monkeypatch.chdir(directory)
+        assert generate_html.main(['build', '--force', '--no-cache', '--archive', *options]) == 0
+        outputs = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(('.html', '.json')) and filename != 'build-manifest.json':
+                with open(directory / filename, 'rb') as f:
+                    outputs[filename] = f.read()
+        return outputs
+
+    return build
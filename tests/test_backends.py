@@ -0,0 +1,19 @@
+# Every way of loading the log must produce the same site
+
+
+def test_sqlite_matches_csv(build_site):
+    expected = build_site('csv')
+    assert build_site('sqlite', '--backend', 'sqlite', '--import-csv') == expected
+
+
+def test_stream_matches_in_memory(build_site):
+    expected = build_site('memory')
+    assert build_site('stream', '--stream', '--chunk-rows', '37') == expected
+
+
+def test_builds_every_page(build_site):
+    outputs = build_site('pages')
+    for filename in ['index.html', 'full-data.html', 'submit.html', 'user-summary.html',
+                     'two-week-summary.html', 'search-index.json', 'periods.json']:
+        assert outputs[filename]
+    assert any(filename.startswith('lift-') for filename in outputs)
@@ -0,0 +1,65 @@
+import os
+
+import requests
+
+from data_source import fetch_url
+
+URL = 'https://example.com/boom_lift_data.csv'
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def iter_content(self, size):
+        for start in range(0, len(self.body), size):
+            yield self.body[start:start + size]
+
+
+def test_fetch_url_revalidates_with_etag(tmp_path, monkeypatch):
+    responses = [FakeResponse(200, b'a,b\r\n1,2\r\n', {'ETag': '"v1"', 'Last-Modified': 'Mon, 06 Jan 2025 10:00:00 GMT'}),
+                 FakeResponse(304)]
+    sent = []
+
+    def get(url, headers, timeout, stream):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests, 'get', get)
+    first = fetch_url(URL, str(tmp_path))
+    second = fetch_url(URL, str(tmp_path))
+
+    assert sent[0] == {}
+    assert sent[1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 06 Jan 2025 10:00:00 GMT'}
+    assert second == first
+    with open(second, 'rb') as f:
+        assert f.read() == b'a,b\r\n1,2\r\n'
+
+
+def test_fetch_url_downloads_again_without_cached_copy(tmp_path, monkeypatch):
+    responses = [FakeResponse(200, b'v1', {'ETag': '"v1"'}), FakeResponse(200, b'v2', {'ETag': '"v2"'})]
+    sent = []
+
+    def get(url, headers, timeout, stream):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests, 'get', get)
+    os.remove(fetch_url(URL, str(tmp_path)))
+    path = fetch_url(URL, str(tmp_path))
+
+    assert sent[1] == {}
+    with open(path, 'rb') as f:
+        assert f.read() == b'v2'
@@ -0,0 +1,36 @@
+import shutil
+
+from fleet_snapshot import is_fresh, load_prepared, load_snapshot, replay, save_snapshot
+from ingest import append_submissions, normalize_submission
+
+
+def replayed(tmp_path, sample_csv):
+    csv_path = str(tmp_path / 'log.csv')
+    shutil.copy(sample_csv, csv_path)
+    snapshot_path = str(tmp_path / 'fleet-state.json')
+    save_snapshot(replay(load_prepared(csv_path, None), csv_path), snapshot_path)
+    return csv_path, snapshot_path
+
+
+def test_same_size_edit_makes_snapshot_stale(tmp_path, sample_csv):
+    csv_path, snapshot_path = replayed(tmp_path, sample_csv)
+    assert is_fresh(load_snapshot(snapshot_path), csv_path)
+
+    with open(csv_path, 'rb') as f:
+        data = bytearray(f.read())
+    position = data.index(b'Installer 00') + len(b'Installer 00')
+    data[position:position + 1] = b'9' if data[position:position + 1] != b'9' else b'8'
+    with open(csv_path, 'wb') as f:
+        f.write(data)
+    assert not is_fresh(load_snapshot(snapshot_path), csv_path)
+
+
+def test_ingest_append_keeps_snapshot_fresh(tmp_path, sample_csv):
+    csv_path, snapshot_path = replayed(tmp_path, sample_csv)
+    row = normalize_submission({'Completion time': '7/1/2025 8:15', 'Name': 'Installer 001',
+                                'Boom Lift ID': 'B_GNE_001', 'Hours': '9999', 'Oil Change': 'on'})
+    append_submissions([row], csv_path, snapshot_path)
+
+    snapshot = load_snapshot(snapshot_path)
+    assert is_fresh(snapshot, csv_path)
+    assert snapshot['lifts'] == replay(load_prepared(csv_path, None), csv_path)['lifts']
@@ -0,0 +1,35 @@
+import csv
+import os
+
+import pytest
+
+from ingest import flush_spool, spool_submission
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_flush_appends_spooled_submissions_in_order(tmp_path):
+    spool_dir = str(tmp_path / 'spool')
+    csv_path = str(tmp_path / 'log.csv')
+    snapshot_path = str(tmp_path / 'fleet-state.json')
+    for hours in ['10', '11', '12']:
+        spool_submission({'Completion time': '2025-03-04T09:30', 'Name': 'Installer 001',
+                          'Boom Lift ID': 'B_GNE_001', 'Hours': hours}, spool_dir)
+
+    assert flush_spool(csv_path, spool_dir, snapshot_path) == 3
+    rows = read_rows(csv_path)
+    assert [row['Hours'] for row in rows] == ['10', '11', '12']
+    assert rows[0]['Completion time'] == '3/4/2025 9:30'
+    assert os.listdir(spool_dir) == []
+    assert flush_spool(csv_path, spool_dir, snapshot_path) == 0
+    assert len(read_rows(csv_path)) == 3
+
+
+def test_spool_rejects_invalid_submission(tmp_path):
+    spool_dir = str(tmp_path / 'spool')
+    with pytest.raises(ValueError, match='Boom Lift ID'):
+        spool_submission({'Completion time': '2025-03-04T09:30', 'Name': 'Installer 001'}, spool_dir)
+    assert not os.path.exists(spool_dir) or os.listdir(spool_dir) == []
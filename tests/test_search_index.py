@@ -0,0 +1,11 @@
+from search_index import tokens
+
+
+def test_tokens_cover_every_script():
+    assert tokens('Ölwechsel fällig, Straße') == {'ölwechsel', 'fällig', 'straße'}
+    assert tokens('ΟΔΟΣ σπασμένη') == {'οδος', 'σπασμένη'}
+    assert tokens('日本語 テスト') == {'日本語', 'テスト'}
+
+
+def test_tokens_normalize_and_split_on_underscores():
+    assert tokens('Réparé hose_clamp x') == {'réparé', 'hose', 'clamp'}